@@ -15,7 +15,8 @@ from enum import Enum
 
 from flask import (
     Flask, flash, redirect, render_template, request, 
-    session, url_for, jsonify, send_from_directory, Response, send_file
+    session, url_for, jsonify, send_from_directory, Response, send_file,
+    stream_with_context
 )
 from flask.json.provider import DefaultJSONProvider
 from werkzeug.utils import secure_filename
@@ -88,6 +89,8 @@ except ImportError:
             pass
         def export_monthly_data(self, *args, **kwargs):
             return None
+        def export_monthly_data_stream(self, *args, **kwargs):
+            raise RuntimeError("Export functionality not available")
         def export_summary(self, *args, **kwargs):
             return None
     def get_filename_for_export(*args, **kwargs):
@@ -614,11 +617,11 @@ def export_month(month):
     """Export a month's expenses as CSV."""
     try:
         export_manager = ExportManager(storage)
-        csv_data = export_manager.export_monthly_data(month)
+        csv_lines = export_manager.export_monthly_data_stream(month)
         filename = get_filename_for_export(month, 'monthly')
         
         return Response(
-            csv_data.getvalue(),
+            stream_with_context(csv_lines),
             mimetype="text/csv",
             headers={"Content-disposition": f"attachment; filename={filename}"}
         )
@@ -1,17 +1,43 @@
 """Configuration settings for Google Cloud Vision OCR."""
 import os
-from typing import Optional
+from functools import lru_cache
+from typing import Optional, Tuple
+
+_ENV_KEYS = (
+    'GOOGLE_APPLICATION_CREDENTIALS',
+    'GOOGLE_VISION_API_ENDPOINT',
+    'GOOGLE_VISION_TIMEOUT',
+    'GOOGLE_VISION_MAX_RETRIES',
+    'GOOGLE_VISION_BATCH_SIZE',
+)
+
+
+@lru_cache(maxsize=32)
+def _parse_env(env_values: Tuple[Optional[str], ...]) -> tuple:
+    """Parse raw environment values; cached on the values themselves."""
+    credentials_path, api_endpoint, timeout, max_retries, batch_size = env_values
+    return (
+        credentials_path,
+        api_endpoint,
+        int('30' if timeout is None else timeout),
+        int('3' if max_retries is None else max_retries),
+        int('10' if batch_size is None else batch_size),
+    )
+
 
 class GoogleVisionConfig:
     """Configuration class for Google Cloud Vision settings."""
     
     def __init__(self):
         """Initialize Google Vision configuration."""
-        self.credentials_path: Optional[str] = os.getenv('GOOGLE_APPLICATION_CREDENTIALS')
-        self.api_endpoint: Optional[str] = os.getenv('GOOGLE_VISION_API_ENDPOINT')
-        self.timeout: int = int(os.getenv('GOOGLE_VISION_TIMEOUT', '30'))
-        self.max_retries: int = int(os.getenv('GOOGLE_VISION_MAX_RETRIES', '3'))
-        self.batch_size: int = int(os.getenv('GOOGLE_VISION_BATCH_SIZE', '10'))
+        credentials_path, api_endpoint, timeout, max_retries, batch_size = _parse_env(
+            tuple(os.environ.get(key) for key in _ENV_KEYS)
+        )
+        self.credentials_path: Optional[str] = credentials_path
+        self.api_endpoint: Optional[str] = api_endpoint
+        self.timeout: int = timeout
+        self.max_retries: int = max_retries
+        self.batch_size: int = batch_size
         
     @property
     def is_configured(self) -> bool:
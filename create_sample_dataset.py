@@ -32,6 +32,11 @@ import time
 import traceback
 import logging
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 # Add project root to path
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
@@ -51,6 +56,12 @@ VENDORS = ["Costco", "Trader Joe's", "Target", "H Mart", "Key Food"]
 
 logger = logging.getLogger(__name__)
 
+def _dumps(data: Any) -> bytes:
+    """Serialize data to indented JSON, using orjson when it is installed."""
+    if orjson is not None:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+    return json.dumps(data, indent=2).encode()
+
 def ensure_dirs():
     """Ensure all required directories exist."""
     for dir_path in [TARGET_DIR, IMAGE_DIR, OCR_DIR, ANNOTATION_DIR]:
@@ -282,8 +293,8 @@ def save_annotation(annotation: Dict[str, Any], image_path: str) -> str:
     base_name = os.path.basename(image_path).split('.')[0]
     annotation_path = os.path.join(ANNOTATION_DIR, f"{base_name}.json")
     
-    with open(annotation_path, "w") as f:
-        json.dump(annotation, f, indent=2)
+    with open(annotation_path, "wb") as f:
+        f.write(_dumps(annotation))
     
     print(f"Saved annotation to: {annotation_path}")
     
@@ -431,6 +442,8 @@ def filter_images_by_vendor(image_paths: List[str], vendor: str) -> List[str]:
 
 def main():
     """Main entry point for the create_sample_dataset script."""
+    global SOURCE_DIR, TARGET_DIR, IMAGE_DIR, OCR_DIR, ANNOTATION_DIR
+    
     # Parse command-line arguments
     parser = argparse.ArgumentParser(description="Create Sample Dataset")
     parser.add_argument("--source", default=SOURCE_DIR, help="Source directory for receipt images")
@@ -442,7 +455,6 @@ def main():
     args = parser.parse_args()
     
     # Update constants
-    global SOURCE_DIR, TARGET_DIR, IMAGE_DIR, OCR_DIR, ANNOTATION_DIR
     SOURCE_DIR = args.source
     TARGET_DIR = args.target
     IMAGE_DIR = os.path.join(TARGET_DIR, "images")
@@ -496,8 +508,8 @@ def main():
 
     # Save dataset
     dataset_file = os.path.join(TARGET_DIR, 'dataset.json')
-    with open(dataset_file, 'w') as f:
-        json.dump(processed_files, f, indent=2)
+    with open(dataset_file, 'wb') as f:
+        f.write(_dumps(processed_files))
     
     print(f"\nDataset saved to {dataset_file}")
 
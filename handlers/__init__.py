@@ -17,6 +17,7 @@ from .handler_registry import (
     get_available_handlers,
     register_handler
 )
+from .dispatcher import dispatch
 
 __all__ = [
     'BaseReceiptHandler',
@@ -28,7 +29,8 @@ __all__ = [
     'get_handler',
     'get_handler_by_name',
     'get_available_handlers',
-    'register_handler'
+    'register_handler',
+    'dispatch'
 ]
 
 # The following will be populated by handler discovery:
@@ -0,0 +1,46 @@
+"""Single-pass store detection for receipt handler dispatch.
+
+Rather than asking every handler in turn whether it recognises a receipt,
+the store tokens of all vendor handlers are combined into one alternation
+with a named group per handler key. A single scan of the text then reports
+which handler owns the receipt.
+"""
+
+import re
+import logging
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+# Store tokens per handler key; the group name is the registry handler key
+_STORE_TOKENS = {
+    'key_food': r'KEY[\s\-]*FOOD',
+    'trader_joes': r'TRADER\s*JOE',
+    'walmart': r'WAL[\s\-]*MART',
+    'costco': r'COSTCO',
+}
+
+_DISPATCH_RE = re.compile(
+    '|'.join(f'(?P<{key}>{token})' for key, token in _STORE_TOKENS.items()),
+    re.IGNORECASE
+)
+
+
+def dispatch(text: str) -> Optional[str]:
+    """
+    Find the handler key for the first store token in the receipt text.
+
+    Args:
+        text: The receipt text to scan
+
+    Returns:
+        The matching handler key, or None if no known store is mentioned
+    """
+    if not text:
+        return None
+
+    match = _DISPATCH_RE.search(text)
+    if match:
+        logger.debug(f"[Dispatcher] Matched '{match.group()}' -> {match.lastgroup}")
+        return match.lastgroup
+    return None
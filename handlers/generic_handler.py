@@ -189,8 +189,12 @@ class GenericReceiptHandler(BaseReceiptHandler):
             if match:
                 date_str = match.group(1)
                 try:
-                    # Try different date formats
-                    for fmt in ['%m/%d/%Y', '%m/%d/%y', '%m-%d-%Y', '%m-%d-%y']:
+                    # Only try the formats that use the separator present
+                    if '/' in date_str:
+                        formats = ('%m/%d/%Y', '%m/%d/%y')
+                    else:
+                        formats = ('%m-%d-%Y', '%m-%d-%y')
+                    for fmt in formats:
                         try:
                             return datetime.strptime(date_str, fmt), 0.7
                         except ValueError:
@@ -11,6 +11,7 @@ from handlers.costco_handler import CostcoReceiptHandler
 from handlers.trader_joes_handler import TraderJoesReceiptHandler
 from handlers.key_food_handler import KeyFoodReceiptHandler
 from handlers.walmart_handler import WalmartReceiptHandler
+from handlers.dispatcher import dispatch
 
 logger = logging.getLogger(__name__)
 
@@ -118,12 +119,29 @@ class HandlerRegistry:
     
     def get_handler(self, text: str) -> Optional[BaseReceiptHandler]:
         """Get the most appropriate handler for the receipt text."""
+        # A single scan usually identifies the store; if that handler is
+        # certain no other can beat it, so polling every handler is skipped
+        dispatched = self._handler_instances.get(dispatch(text))
+        dispatched_confidence = None
+        if dispatched:
+            try:
+                dispatched_confidence = dispatched.can_handle_receipt(text)
+                if dispatched_confidence >= 1.0:
+                    return dispatched
+            except Exception as e:
+                logger.error(f"Error checking dispatched handler: {e}")
+                dispatched_confidence = 0.0
+        
         best_handler = None
         best_confidence = 0.0
         
         for name, handler in self._handler_instances.items():
             try:
-                confidence = handler.can_handle_receipt(text)
+                # Reuse the dispatched handler's answer rather than asking twice
+                if handler is dispatched:
+                    confidence = dispatched_confidence
+                else:
+                    confidence = handler.can_handle_receipt(text)
                 if confidence > best_confidence:
                     best_confidence = confidence
                     best_handler = handler
@@ -2,7 +2,7 @@
 
 import re
 import logging
-from typing import Dict, Any, List, Optional, Tuple
+from typing import Dict, Any, List, Optional, Tuple, Union
 from decimal import Decimal
 from datetime import datetime
 
@@ -11,46 +11,84 @@ from models.receipt import Receipt, ReceiptItem
 
 logger = logging.getLogger(__name__)
 
+# Patterns used outside the class-level pattern tables, compiled once at import
+_SLOGAN_RE = re.compile(r'SAVE\s*MONEY\.*\s*LIVE\s*BETTER')
+_TC_RE = re.compile(r'TC#\s*(\d+-\d+-\d+)')
+_STORE_NUM_RE = re.compile(r'STORE\s*#?\s*(\d+)')
+_CASHIER_RE = re.compile(r'CASHIER:?\s*([A-Z0-9]+)')
+_REGISTER_RE = re.compile(r'REG(?:ISTER)?:?\s*#?(\d+)')
+_DEPT_CODE_RE = re.compile(r'^(\d{3,4})\s+(.+)$')
+
+_PAYMENT_PATTERNS = [
+    (re.compile(r'VISA\s*\**\d{4}', re.IGNORECASE), 'VISA', 0.9),
+    (re.compile(r'MASTERCARD\s*\**\d{4}', re.IGNORECASE), 'MASTERCARD', 0.9),
+    (re.compile(r'AMEX\s*\**\d{4}', re.IGNORECASE), 'AMEX', 0.9),
+    (re.compile(r'DISCOVER\s*\**\d{4}', re.IGNORECASE), 'DISCOVER', 0.9),
+    (re.compile(r'CASH', re.IGNORECASE), 'CASH', 0.9),
+    (re.compile(r'DEBIT', re.IGNORECASE), 'DEBIT', 0.8),
+    (re.compile(r'EBT', re.IGNORECASE), 'EBT', 0.9),
+    (re.compile(r'WALMART\s*PAY', re.IGNORECASE), 'WALMART PAY', 0.95),
+]
+
 class WalmartReceiptHandler(BaseReceiptHandler):
     """Handler for Walmart receipts."""
     
     STORE_NAME_PATTERNS = [
-        r'WALMART',
-        r'WAL\s*MART',
-        r'WAL-MART',
-        r'WALMART\s*SUPERCENTER',
+        re.compile(r'WALMART'),
+        re.compile(r'WAL\s*MART'),
+        re.compile(r'WAL-MART'),
+        re.compile(r'WALMART\s*SUPERCENTER'),
     ]
     
     ITEM_PATTERNS = [
         # Standard item with price and optional department code
-        r'^(?:\d{3,4}\s+)?([A-Z0-9\s\-\'\.&]+?)\s+(\d+\.\d{2})$',
+        re.compile(r'^(?:\d{3,4}\s+)?([A-Z0-9\s\-\'\.&]+?)\s+(\d+\.\d{2})$'),
         # Quantity-based item
-        r'^(\d+)\s*@\s*([A-Z0-9\s\-\'\.&]+?)\s+(\d+\.\d{2})$',
+        re.compile(r'^(\d+)\s*@\s*([A-Z0-9\s\-\'\.&]+?)\s+(\d+\.\d{2})$'),
         # Weight-based item
-        r'^([\d\.]+)\s*(?:LB|lb|Lb)\s*@\s*\$?([\d\.]+)/(?:LB|lb|Lb)\s+([A-Z0-9\s\-\'\.&]+?)\s+(\d+\.\d{2})$',
+        re.compile(r'^([\d\.]+)\s*(?:LB|lb|Lb)\s*@\s*\$?([\d\.]+)/(?:LB|lb|Lb)\s+([A-Z0-9\s\-\'\.&]+?)\s+(\d+\.\d{2})$'),
         # UPC code item
-        r'^(?:\*+)?(\d{12,13})\s+([A-Z0-9\s\-\'\.&]+?)\s+(\d+\.\d{2})$'
+        re.compile(r'^(?:\*+)?(\d{12,13})\s+([A-Z0-9\s\-\'\.&]+?)\s+(\d+\.\d{2})$')
     ]
     
+    # All item patterns in one alternation, in the order extract_items tries
+    # them, so each line is matched once; the branch name says which matched
+    ITEM_LINE_PATTERN = re.compile('|'.join(
+        f'(?P<{kind}>{pattern.pattern})'
+        for kind, pattern in zip(
+            ('upc', 'standard', 'quantity', 'weight'),
+            (ITEM_PATTERNS[3], ITEM_PATTERNS[0], ITEM_PATTERNS[1], ITEM_PATTERNS[2])
+        )
+    ))
+    
+    _ITEM_GROUP_COUNTS = {'upc': 3, 'standard': 2, 'quantity': 3, 'weight': 4}
+    
     TOTAL_PATTERNS = [
-        r'TOTAL\s*\$?\s*(\d+\.\d{2})',
-        r'SUBTOTAL\s*\$?\s*(\d+\.\d{2})',
-        r'BALANCE\s*DUE\s*\$?\s*(\d+\.\d{2})'
+        re.compile(r'TOTAL\s*\$?\s*(\d+\.\d{2})'),
+        re.compile(r'SUBTOTAL\s*\$?\s*(\d+\.\d{2})'),
+        re.compile(r'BALANCE\s*DUE\s*\$?\s*(\d+\.\d{2})')
     ]
     
     TAX_PATTERNS = [
-        r'(?:SALES\s*)?TAX\s*\$?\s*(\d+\.\d{2})',
-        r'(?:STATE|COUNTY)\s*TAX\s*\$?\s*(\d+\.\d{2})'
+        re.compile(r'(?:SALES\s*)?TAX\s*\$?\s*(\d+\.\d{2})'),
+        re.compile(r'(?:STATE|COUNTY)\s*TAX\s*\$?\s*(\d+\.\d{2})')
     ]
     
     SUBTOTAL_PATTERNS = [
-        r'SUBTOTAL\s*\$?\s*(\d+\.\d{2})',
-        r'SUB\s*TOTAL\s*\$?\s*(\d+\.\d{2})'
+        re.compile(r'SUBTOTAL\s*\$?\s*(\d+\.\d{2})'),
+        re.compile(r'SUB\s*TOTAL\s*\$?\s*(\d+\.\d{2})')
     ]
     
+    # Lines matching any total/tax/subtotal pattern are not items; a single
+    # alternation lets extract_items test each line in one pass
+    SUMMARY_PATTERN = re.compile('|'.join(
+        f'(?:{pattern.pattern})'
+        for pattern in TOTAL_PATTERNS + TAX_PATTERNS + SUBTOTAL_PATTERNS
+    ))
+    
     DATE_PATTERNS = [
-        r'(\d{1,2}/\d{1,2}/\d{2,4})',
-        r'(\d{2}-\d{2}-\d{2,4})'
+        re.compile(r'(\d{1,2}/\d{1,2}/\d{2,4})'),
+        re.compile(r'(\d{2}-\d{2}-\d{2,4})')
     ]
     
     def __init__(self):
@@ -71,11 +109,11 @@ class WalmartReceiptHandler(BaseReceiptHandler):
             
         # Check for Walmart specific formatting
         format_confidence = 0.0
-        if re.search(r'SAVE\s*MONEY\.*\s*LIVE\s*BETTER', text):
+        if _SLOGAN_RE.search(text):
             format_confidence += 0.4
-        if re.search(r'TC#\s*\d+-\d+-\d+', text):
+        if _TC_RE.search(text):
             format_confidence += 0.3
-        if any(re.search(pattern, text) for pattern in self.TOTAL_PATTERNS):
+        if any(pattern.search(text) for pattern in self.TOTAL_PATTERNS):
             format_confidence += 0.3
             
         return min(store_confidence * (0.7 + format_confidence), 1.0)
@@ -86,7 +124,7 @@ class WalmartReceiptHandler(BaseReceiptHandler):
         confidence = 0.0
         
         # Try to find store number
-        store_match = re.search(r'STORE\s*#?\s*(\d+)', text)
+        store_match = _STORE_NUM_RE.search(text)
         if store_match:
             self.store_number = store_match.group(1)
             store_name = f"WALMART #{self.store_number}"
@@ -94,29 +132,29 @@ class WalmartReceiptHandler(BaseReceiptHandler):
         else:
             # Look for simpler matches
             for pattern in self.STORE_NAME_PATTERNS:
-                if re.search(pattern, text):
+                if pattern.search(text):
                     confidence = 0.8
                     break
         
         # Extract additional metadata
-        cashier_match = re.search(r'CASHIER:?\s*([A-Z0-9]+)', text)
+        cashier_match = _CASHIER_RE.search(text)
         if cashier_match:
             self.cashier = cashier_match.group(1)
             
-        register_match = re.search(r'REG(?:ISTER)?:?\s*#?(\d+)', text)
+        register_match = _REGISTER_RE.search(text)
         if register_match:
             self.register = register_match.group(1)
             
-        trans_match = re.search(r'TC#\s*(\d+-\d+-\d+)', text)
+        trans_match = _TC_RE.search(text)
         if trans_match:
             self.transaction_id = trans_match.group(1)
         
         return store_name, confidence
     
-    def extract_items(self, text: str) -> List[ReceiptItem]:
-        """Extract items from the receipt text."""
+    def extract_items(self, text: Union[str, List[str]]) -> List[ReceiptItem]:
+        """Extract items from the receipt text, or from its already split lines."""
         items = []
-        lines = text.split('\n')
+        lines = text if isinstance(text, list) else text.split('\n')
         
         for line in lines:
             line = line.strip()
@@ -124,31 +162,30 @@ class WalmartReceiptHandler(BaseReceiptHandler):
                 continue
                 
             # Skip header/footer lines
-            if any(re.search(pattern, line) for pattern in 
-                  self.TOTAL_PATTERNS + self.TAX_PATTERNS + self.SUBTOTAL_PATTERNS):
+            if self.SUMMARY_PATTERN.search(line):
                 continue
             
             item = None
-            confidence = 0.0
-            
-            # Try UPC code pattern first
-            match = re.match(self.ITEM_PATTERNS[3], line)
+            match = self.ITEM_LINE_PATTERN.match(line)
             if match:
-                upc, name, price = match.groups()
-                item = ReceiptItem(
-                    name=name.strip(),
-                    price=Decimal(price),
-                    quantity=Decimal('1'),
-                    confidence=0.95,
-                    notes=f"UPC: {upc}"
-                )
-            
-            # Try standard item pattern with department code
-            if not item:
-                match = re.match(self.ITEM_PATTERNS[0], line)
-                if match:
-                    name, price = match.groups()
-                    dept_match = re.match(r'^(\d{3,4})\s+(.+)$', name)
+                kind = match.lastgroup
+                # The branch's own groups follow its named group
+                first = self.ITEM_LINE_PATTERN.groupindex[kind]
+                groups = match.groups()[first:first + self._ITEM_GROUP_COUNTS[kind]]
+                
+                if kind == 'upc':
+                    upc, name, price = groups
+                    item = ReceiptItem(
+                        name=name.strip(),
+                        price=Decimal(price),
+                        quantity=Decimal('1'),
+                        confidence=0.95,
+                        notes=f"UPC: {upc}"
+                    )
+                elif kind == 'standard':
+                    # Standard item pattern with department code
+                    name, price = groups
+                    dept_match = _DEPT_CODE_RE.match(name)
                     if dept_match:
                         dept_code, name = dept_match.groups()
                         self.department_codes[name.strip()] = dept_code
@@ -158,24 +195,16 @@ class WalmartReceiptHandler(BaseReceiptHandler):
                         quantity=Decimal('1'),
                         confidence=0.9
                     )
-            
-            # Try quantity-based pattern
-            if not item:
-                match = re.match(self.ITEM_PATTERNS[1], line)
-                if match:
-                    qty, name, price = match.groups()
+                elif kind == 'quantity':
+                    qty, name, price = groups
                     item = ReceiptItem(
                         name=name.strip(),
                         price=Decimal(price),
                         quantity=Decimal(qty),
                         confidence=0.85
                     )
-            
-            # Try weight-based pattern
-            if not item:
-                match = re.match(self.ITEM_PATTERNS[2], line)
-                if match:
-                    weight, price_per_lb, name, total = match.groups()
+                else:
+                    weight, price_per_lb, name, total = groups
                     item = ReceiptItem(
                         name=name.strip(),
                         price=Decimal(total),
@@ -205,7 +234,7 @@ class WalmartReceiptHandler(BaseReceiptHandler):
     def extract_total(self, text: str) -> Tuple[Optional[Decimal], float]:
         """Extract total amount from receipt text."""
         for pattern in self.TOTAL_PATTERNS:
-            match = re.search(pattern, text)
+            match = pattern.search(text)
             if match:
                 try:
                     total = Decimal(match.group(1))
@@ -225,7 +254,7 @@ class WalmartReceiptHandler(BaseReceiptHandler):
         confidence = 0.0
         
         for pattern in self.TAX_PATTERNS:
-            match = re.search(pattern, text)
+            match = pattern.search(text)
             if match:
                 try:
                     tax = Decimal(match.group(1))
@@ -241,12 +270,16 @@ class WalmartReceiptHandler(BaseReceiptHandler):
     def extract_date(self, text: str) -> Tuple[Optional[datetime], float]:
         """Extract date from receipt text."""
         for pattern in self.DATE_PATTERNS:
-            match = re.search(pattern, text)
+            match = pattern.search(text)
             if match:
                 date_str = match.group(1)
                 try:
-                    # Try different date formats
-                    for fmt in ['%m/%d/%Y', '%m/%d/%y', '%m-%d-%Y', '%m-%d-%y']:
+                    # Only try the formats that use the separator present
+                    if '/' in date_str:
+                        formats = ('%m/%d/%Y', '%m/%d/%y')
+                    else:
+                        formats = ('%m-%d-%Y', '%m-%d-%y')
+                    for fmt in formats:
                         try:
                             return datetime.strptime(date_str, fmt), 0.9
                         except ValueError:
@@ -258,19 +291,8 @@ class WalmartReceiptHandler(BaseReceiptHandler):
     
     def extract_payment_method(self, text: str) -> Tuple[Optional[str], float]:
         """Extract payment method from receipt text."""
-        payment_patterns = {
-            r'VISA\s*\**\d{4}': ('VISA', 0.9),
-            r'MASTERCARD\s*\**\d{4}': ('MASTERCARD', 0.9),
-            r'AMEX\s*\**\d{4}': ('AMEX', 0.9),
-            r'DISCOVER\s*\**\d{4}': ('DISCOVER', 0.9),
-            r'CASH': ('CASH', 0.9),
-            r'DEBIT': ('DEBIT', 0.8),
-            r'EBT': ('EBT', 0.9),
-            r'WALMART\s*PAY': ('WALMART PAY', 0.95)
-        }
-        
-        for pattern, (method, conf) in payment_patterns.items():
-            if re.search(pattern, text, re.IGNORECASE):
+        for pattern, method, conf in _PAYMENT_PATTERNS:
+            if pattern.search(text):
                 return method, conf
         
         return None, 0.0
@@ -104,11 +104,16 @@ class Expense(BaseModel):
         if not self.items:
             return 0.0
             
-        # Calculate the amount for shared items
-        shared_items_amount = sum(item.amount for item in self.items if item.shared)
+        # Sum shared and overall item amounts in a single pass
+        shared_items_amount = 0.0
+        items_amount = 0.0
+        for item in self.items:
+            items_amount += item.amount
+            if item.shared:
+                shared_items_amount += item.amount
         
         # Calculate the proportion of shared items
-        shared_proportion = shared_items_amount / sum(item.amount for item in self.items)
+        shared_proportion = shared_items_amount / items_amount
         
         # Apply the proportion to the total (includes tax and other fees)
         self.shared_total = round(self.total_amount * shared_proportion, 2)
@@ -121,6 +126,15 @@ class Expense(BaseModel):
         
         # Half of the shared amount is owed by the other person
         return round(self.shared_total / 2, 2)
+    
+    def balance_delta(self) -> float:
+        """
+        Calculate this expense's contribution to the net balance.
+        Positive: Roni owes Alvand
+        Negative: Alvand owes Roni
+        """
+        amount_owed = self.amount_owed()
+        return amount_owed if self.payer == User.ALVAND else -amount_owed
 
 
 class BalanceSheet(BaseModel):
@@ -137,40 +151,32 @@ class BalanceSheet(BaseModel):
         balance = 0.0
         
         for expense in self.expenses:
-            # First make sure shared_total is calculated
-            if expense.shared_total is None:
-                expense.calculate_shared_total()
-                
-            # Calculate the amount owed to the payer
-            amount_owed = expense.amount_owed()
-            
-            # Adjust the balance based on payer
-            if expense.payer == User.ALVAND:
-                balance += amount_owed  # Roni owes Alvand
-            else:
-                balance -= amount_owed  # Alvand owes Roni
+            balance += expense.balance_delta()
         
         return round(balance, 2)
     
     def summary(self) -> dict:
         """Generate a summary of the balance sheet."""
-        total_expenses = sum(expense.total_amount for expense in self.expenses)
-        total_shared = sum(
-            expense.shared_total if expense.shared_total is not None 
-            else expense.calculate_shared_total() 
-            for expense in self.expenses
-        )
+        total_expenses = 0.0
+        total_shared = 0.0
+        alvand_paid = 0.0
+        roni_paid = 0.0
+        balance = 0.0
         
-        alvand_paid = sum(
-            expense.total_amount for expense in self.expenses 
-            if expense.payer == User.ALVAND
-        )
-        roni_paid = sum(
-            expense.total_amount for expense in self.expenses 
-            if expense.payer == User.RONI
-        )
+        # Accumulate every total, and the net balance, in one walk over the expenses
+        for expense in self.expenses:
+            total_expenses += expense.total_amount
+            total_shared += (
+                expense.shared_total if expense.shared_total is not None
+                else expense.calculate_shared_total()
+            )
+            if expense.payer == User.ALVAND:
+                alvand_paid += expense.total_amount
+            elif expense.payer == User.RONI:
+                roni_paid += expense.total_amount
+            balance += expense.balance_delta()
         
-        balance = self.net_balance
+        balance = round(balance, 2)
         
         if balance > 0:
             owed_statement = f"Roni owes Alvand ${balance:.2f}"
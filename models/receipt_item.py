@@ -2,11 +2,15 @@
 Receipt item model for representing individual items on a receipt.
 """
 
+import sys
 from dataclasses import dataclass, field
 from typing import Dict, Any, Optional
 from decimal import Decimal
 
-@dataclass
+# Slotted dataclasses (Python 3.10+) drop the per-instance __dict__
+_DATACLASS_OPTIONS = {'slots': True} if sys.version_info >= (3, 10) else {}
+
+@dataclass(**_DATACLASS_OPTIONS)
 class ReceiptItem:
     """
     Represents a single item on a receipt.
@@ -148,6 +148,8 @@ class ReceiptService:
             options: Processing options
                 - store_hint: Expected store name
                 - ocr_engine: Override OCR engine
+                - ocr_text: Text already extracted from the image; skips
+                  preprocessing and OCR
                 
         Returns:
             Dictionary containing extracted receipt information
@@ -158,13 +160,17 @@ class ReceiptService:
                 ocr = options['ocr_engine']
             else:
                 ocr = self.ocr
+            ocr_text = options.get('ocr_text') if options else None
                 
-            # Preprocess image
-            processed_image = self.preprocessor.preprocess(image_path)
-            
-            # Extract text using OCR
-            if ocr is not None:
+            # Extract text using OCR, unless the caller already has it
+            if ocr_text is not None:
+                logger.info("Using provided OCR text")
+                text = ocr_text
+                confidence = None
+                text_blocks = []
+            elif ocr is not None:
                 logger.info("Using configured OCR engine")
+                processed_image = self.preprocessor.preprocess(image_path)
                 ocr_result = ocr.extract_text(processed_image)
                 text = ocr_result["text"]
                 confidence = ocr_result["confidence"]
@@ -190,12 +196,17 @@ class ReceiptService:
             store_hint = options.get('store_hint') if options else None
             results = self.analyzer.analyze_receipt(text, image_path, store_hint=store_hint)
             
-            # Add OCR metadata
+            # Add OCR metadata (no engine or timing when the text was provided)
+            if ocr_text is not None:
+                engine, processing_time = None, 0
+            else:
+                engine = 'google_vision' if isinstance(ocr, GoogleVisionOCR) else 'tesseract'
+                processing_time = getattr(ocr, 'last_processing_time', 0)
             results['ocr_metadata'] = {
-                'engine': 'google_vision' if isinstance(ocr, GoogleVisionOCR) else 'tesseract',
+                'engine': engine,
                 'confidence': confidence,
                 'text_blocks': text_blocks,
-                'processing_time': getattr(ocr, 'last_processing_time', 0)
+                'processing_time': processing_time
             }
             
             return results
@@ -6,11 +6,9 @@ Test script for Trader Joe's receipt parsing using the parse-receipt API endpoin
 import os
 import sys
 import json
-import requests
 from pprint import pprint
 from glob import glob
 import io
-from PIL import Image
 
 # Configuration
 BASE_URL = "http://127.0.0.1:5003"
@@ -22,7 +20,6 @@ os.environ['no_proxy'] = '127.0.0.1,localhost'
 
 def resize_image_if_needed(image_path, max_size_mb=3):
     """Resize image if it's too large to reduce upload time"""
-    img = Image.open(image_path)
     img_size_bytes = os.path.getsize(image_path)
     img_size_mb = img_size_bytes / (1024 * 1024)
     
@@ -30,6 +27,11 @@ def resize_image_if_needed(image_path, max_size_mb=3):
         print(f"Image size is {img_size_mb:.2f}MB, no resizing needed")
         return image_path
     
+    # Only decode the image once we know it has to be resized
+    from PIL import Image
+
+    img = Image.open(image_path)
+    
     # Calculate new dimensions to reduce size
     width, height = img.size
     print(f"Original image dimensions: {width}x{height}, size: {img_size_mb:.2f}MB")
@@ -53,6 +55,8 @@ def resize_image_if_needed(image_path, max_size_mb=3):
 
 def test_parse_receipt(image_path, store_hint=None):
     """Test the receipt parsing API endpoint with a given image."""
+    import requests
+
     if not os.path.exists(image_path):
         print(f"Error: File {image_path} not found")
         sys.exit(1)
@@ -100,9 +104,9 @@ def test_parse_receipt(image_path, store_hint=None):
         items = parsed_data.get('items', [])
         if items:
             print(f"\nDetected {len(items)} items:")
-            for i, item in enumerate(items, 1):
-                price = item.get('price', 0) or item.get('amount', 0)
-                print(f"{i}. {item.get('name', 'Unknown')} - ${price}")
+            lines = [f"{i}. {item.get('name', 'Unknown')} - ${item.get('price', 0) or item.get('amount', 0)}"
+                     for i, item in enumerate(items, 1)]
+            sys.stdout.write("\n".join(lines) + "\n")
         else:
             print("\nNo items detected")
     else:
@@ -118,9 +122,9 @@ def test_parse_receipt(image_path, store_hint=None):
             items = partial.get('items', [])
             if items:
                 print(f"\nDetected {len(items)} items:")
-                for i, item in enumerate(items, 1):
-                    price = item.get('price', 0) or item.get('amount', 0)
-                    print(f"{i}. {item.get('name', 'Unknown')} - ${price}")
+                lines = [f"{i}. {item.get('name', 'Unknown')} - ${item.get('price', 0) or item.get('amount', 0)}"
+                         for i, item in enumerate(items, 1)]
+                sys.stdout.write("\n".join(lines) + "\n")
     
     # Return the result for potential further processing
     return result
@@ -1,12 +1,20 @@
 """Test configuration and fixtures."""
 import os
+import sys
 import pytest
 from unittest.mock import Mock, patch
-from google.cloud import vision
+
+# Make the project root importable from every test module (and xdist worker)
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+def pytest_addoption(parser):
+    parser.addoption("--store", action="store", default=None, 
+                     help="Filter vendor handler tests by store name (e.g., costco, h_mart)")
 
 @pytest.fixture
 def mock_vision_client():
     """Create a mock Vision client."""
+    # patch() imports google.cloud.vision itself, only for tests that use this fixture
     with patch('google.cloud.vision.ImageAnnotatorClient') as mock_client:
         # Set up mock response
         mock_response = Mock()
@@ -28,34 +36,47 @@ def mock_vision_client():
         mock_client.return_value.document_text_detection.return_value = mock_response
         yield mock_client.return_value
 
+_CREDENTIALS_CONTENT = {
+    "type": "service_account",
+    "project_id": "test-project",
+    "private_key_id": "test-key-id",
+    "private_key": "test-private-key",
+    "client_email": "test@test-project.iam.gserviceaccount.com",
+    "client_id": "test-client-id",
+    "auth_uri": "https://accounts.google.com/o/oauth2/auth",
+    "token_uri": "https://oauth2.googleapis.com/token",
+    "auth_provider_x509_cert_url": "https://www.googleapis.com/oauth2/v1/certs",
+    "client_x509_cert_url": "https://www.googleapis.com/robot/v1/metadata/x509/test"
+}
+
+_VISION_CONFIG_ENV = {
+    'GOOGLE_VISION_API_ENDPOINT': 'https://test-endpoint',
+    'GOOGLE_VISION_TIMEOUT': '60',
+    'GOOGLE_VISION_MAX_RETRIES': '5',
+    'GOOGLE_VISION_BATCH_SIZE': '20'
+}
+
 @pytest.fixture
 def mock_credentials(tmp_path):
     """Create mock Google Cloud credentials."""
     creds_file = tmp_path / "test_credentials.json"
-    creds_content = {
-        "type": "service_account",
-        "project_id": "test-project",
-        "private_key_id": "test-key-id",
-        "private_key": "test-private-key",
-        "client_email": "test@test-project.iam.gserviceaccount.com",
-        "client_id": "test-client-id",
-        "auth_uri": "https://accounts.google.com/o/oauth2/auth",
-        "token_uri": "https://oauth2.googleapis.com/token",
-        "auth_provider_x509_cert_url": "https://www.googleapis.com/oauth2/v1/certs",
-        "client_x509_cert_url": "https://www.googleapis.com/robot/v1/metadata/x509/test"
-    }
-    
-    creds_file.write_text(str(creds_content))
+    creds_file.write_text(str(_CREDENTIALS_CONTENT))
     with patch.dict(os.environ, {'GOOGLE_APPLICATION_CREDENTIALS': str(creds_file)}):
         yield str(creds_file)
 
 @pytest.fixture
 def mock_vision_config():
     """Create mock Google Vision configuration."""
-    with patch.dict(os.environ, {
-        'GOOGLE_VISION_API_ENDPOINT': 'https://test-endpoint',
-        'GOOGLE_VISION_TIMEOUT': '60',
-        'GOOGLE_VISION_MAX_RETRIES': '5',
-        'GOOGLE_VISION_BATCH_SIZE': '20'
-    }):
-        yield 
\ No newline at end of file
+    with patch.dict(os.environ, _VISION_CONFIG_ENV):
+        yield
+
+@pytest.fixture(scope="session")
+def session_vision_env(tmp_path_factory):
+    """Environment for a mocked Google Vision setup, shared by session-scoped fixtures.
+    
+    The variables are not applied to os.environ; fixtures patch them in only
+    while constructing the objects that read them.
+    """
+    creds_file = tmp_path_factory.mktemp("credentials") / "test_credentials.json"
+    creds_file.write_text(str(_CREDENTIALS_CONTENT))
+    return {**_VISION_CONFIG_ENV, 'GOOGLE_APPLICATION_CREDENTIALS': str(creds_file)} 
\ No newline at end of file
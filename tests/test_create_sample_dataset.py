@@ -0,0 +1,52 @@
+"""Tests for building the sample dataset from uploaded receipts."""
+import pytest
+from unittest.mock import Mock, patch
+
+from utils import create_sample_dataset
+
+OCR_TEXT = "TRADER JOE'S\nBANANAS 0.99\nTOTAL 0.99"
+
+@pytest.fixture
+def sample_worker(tmp_path):
+    """Set up the per-worker state _process_sample reads, with a mocked service."""
+    (tmp_path / "images").mkdir()
+    service = Mock()
+    service.preprocessor.extract_text.return_value = OCR_TEXT
+    service.process_receipt.return_value = {
+        'store_name': "Trader Joe's",
+        'total': 0.99,
+        'items': [{'name': 'BANANAS', 'price': 0.99}],
+    }
+    with patch.multiple(create_sample_dataset,
+                        _receipt_service=service,
+                        _analyzer=Mock(),
+                        _sample_dir=str(tmp_path)), \
+         patch.object(create_sample_dataset, 'process_vendor_specifics',
+                      side_effect=lambda result, *args: result):
+        yield service
+
+@pytest.fixture
+def image_path(tmp_path):
+    path = tmp_path / "receipt.jpg"
+    path.write_bytes(b"dummy image content")
+    return str(path)
+
+def test_process_sample_runs_ocr_once(sample_worker, image_path):
+    """OCR runs once on the image bytes and its text is handed to process_receipt."""
+    result, metadata_path = create_sample_dataset._process_sample(image_path)
+
+    sample_worker.preprocessor.extract_text.assert_called_once_with(
+        b"dummy image content", sample_worker.ocr)
+    sample_worker.process_receipt.assert_called_once_with(image_path, {'ocr_text': OCR_TEXT})
+    assert result['ocr_text'] == OCR_TEXT
+    assert result['store_name'] == "Trader Joe's"
+    assert result['items_count'] == 1
+    assert result['processing_status'] == "completed"
+    assert metadata_path.endswith(".json")
+
+def test_process_sample_skips_image_without_text(sample_worker, image_path):
+    """An image OCR finds no text in is skipped instead of being processed again."""
+    sample_worker.preprocessor.extract_text.return_value = ''
+
+    assert create_sample_dataset._process_sample(image_path) is None
+    sample_worker.process_receipt.assert_not_called()
@@ -0,0 +1,88 @@
+"""Tests for sending email over a shared SMTP session."""
+import smtplib
+import pytest
+from unittest.mock import Mock, patch
+
+from utils.email_service import EmailService
+
+def _messages(count):
+    return [(f"Subject {i}", f"<p>Body {i}</p>", None) for i in range(count)]
+
+@pytest.fixture
+def smtp_connections():
+    """Patch smtplib.SMTP so every connection is a fresh mock, recorded in order."""
+    connections = []
+
+    def _connect(*args, **kwargs):
+        server = Mock()
+        server.noop.return_value = (250, b"OK")
+        connections.append(server)
+        return server
+
+    with patch('utils.email_service.smtplib.SMTP', side_effect=_connect):
+        yield connections
+
+@pytest.fixture
+def email_service():
+    service = EmailService(
+        sender_email="sender@example.com",
+        sender_password="password",
+        recipients=["roommate@example.com"],
+        max_per_conn=2
+    )
+    with service:
+        yield service
+
+def test_reconnects_after_max_per_conn(smtp_connections, email_service):
+    """A session is closed and replaced once it has carried max_per_conn messages."""
+    assert email_service.send_bulk(_messages(5)) == [True] * 5
+
+    assert len(smtp_connections) == 3
+    assert [conn.send_message.call_count for conn in smtp_connections] == [2, 2, 1]
+    smtp_connections[0].quit.assert_called_once()
+    smtp_connections[1].quit.assert_called_once()
+
+def test_retries_once_on_server_disconnect(email_service):
+    """A send on a dropped session is retried once on a new connection."""
+    with patch('utils.email_service.smtplib.SMTP') as smtp:
+        dropped, fresh = Mock(), Mock()
+        dropped.send_message.side_effect = smtplib.SMTPServerDisconnected("gone")
+        smtp.side_effect = [dropped, fresh]
+
+        assert email_service.send_email("Subject", "<p>Body</p>") is True
+
+    assert smtp.call_count == 2
+    dropped.close.assert_called_once()
+    fresh.send_message.assert_called_once()
+
+def test_gives_up_after_one_retry(email_service):
+    """A second disconnect fails the send instead of reconnecting again."""
+    with patch('utils.email_service.smtplib.SMTP') as smtp:
+        smtp.return_value.send_message.side_effect = smtplib.SMTPServerDisconnected("gone")
+
+        assert email_service.send_email("Subject", "<p>Body</p>") is False
+
+    assert smtp.call_count == 2
+
+def test_bulk_continues_after_refused_recipients(email_service):
+    """Refused recipients fail only their own message, on the same session."""
+    with patch('utils.email_service.smtplib.SMTP') as smtp:
+        server = smtp.return_value
+        server.noop.return_value = (250, b"OK")
+        server.send_message.side_effect = [
+            smtplib.SMTPRecipientsRefused({"bad@example.com": (550, b"No such user")}),
+            None,
+            None
+        ]
+
+        assert email_service.send_bulk(_messages(3)) == [False, True, True]
+
+    assert smtp.call_count == 1
+    assert server.send_message.call_count == 3
+
+def test_bulk_without_credentials_sends_nothing(smtp_connections):
+    """Without sender credentials every message is reported as not sent."""
+    service = EmailService(recipients=["roommate@example.com"])
+
+    assert service.send_bulk(_messages(3)) == [False] * 3
+    assert smtp_connections == []
@@ -104,7 +104,7 @@ def test_estimate_confidence(vision_ocr):
     ]
     
     confidence = vision_ocr._estimate_confidence(mock_symbols)
-    assert confidence == pytest.approx(0.8833, rel=1e-3)
+    assert confidence == pytest.approx((0.9 + 0.8 + 0.95) / 3)
 
 def test_extract_text_blocks(vision_ocr):
     """Test extraction of text blocks with positions."""
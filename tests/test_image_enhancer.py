@@ -0,0 +1,43 @@
+"""Tests for the OpenCV image enhancement against PIL's ImageEnhance."""
+import numpy as np
+import pytest
+from PIL import Image, ImageEnhance
+
+from utils.image_enhancer import ImageEnhancer
+
+def _pil_adjust(gray_image, contrast, brightness, sharpness):
+    """The PIL enhancer chain ImageEnhancer.enhance used before moving to OpenCV."""
+    pil_image = Image.fromarray(gray_image)
+    pil_image = ImageEnhance.Contrast(pil_image).enhance(contrast)
+    pil_image = ImageEnhance.Brightness(pil_image).enhance(brightness)
+    pil_image = ImageEnhance.Sharpness(pil_image).enhance(sharpness)
+    return np.asarray(pil_image)
+
+@pytest.fixture
+def receipt_like_image():
+    """Light paper with dark text strokes, noise, and fully saturated pixels."""
+    rng = np.random.RandomState(0)
+    image = rng.normal(200, 25, (120, 160)).clip(0, 255).astype(np.uint8)
+    image[20:30, 10:150] = 30
+    image[60:64, 10:100] = 0
+    image[90:100, 40:120] = 255
+    return image
+
+@pytest.mark.parametrize("contrast,brightness,sharpness", [
+    (1.5, 1.2, 1.5),  # the enhance() defaults
+    (3.0, 0.5, 1.0),  # saturates in the contrast stage, then darkens
+    (0.5, 1.8, 2.0),
+])
+def test_adjust_matches_pil(receipt_like_image, contrast, brightness, sharpness):
+    """Interior pixels match PIL's enhancers to within rounding."""
+    enhancer = ImageEnhancer("unused.jpg")
+
+    adjusted = enhancer._adjust(receipt_like_image, contrast, brightness, sharpness)
+    expected = _pil_adjust(receipt_like_image, contrast, brightness, sharpness)
+
+    assert adjusted.dtype == np.uint8
+    assert adjusted.shape == expected.shape
+    # PIL leaves the one-pixel border unsharpened, so compare the interior only
+    diff = np.abs(adjusted[1:-1, 1:-1].astype(int) - expected[1:-1, 1:-1].astype(int))
+    assert diff.max() <= 5
+    assert diff.mean() < 1.0
@@ -8,12 +8,13 @@ from handlers.key_food_handler import KeyFoodHandler
 class TestKeyFoodHandler(unittest.TestCase):
     """Test cases for Key Food receipt handler."""
     
-    def setUp(self):
-        """Set up test cases."""
-        self.handler = KeyFoodHandler()
+    @classmethod
+    def setUpClass(cls):
+        """Set up fixtures shared by all test cases."""
+        cls.handler = KeyFoodHandler()
         
         # Sample receipt text
-        self.sample_receipt = """
+        cls.sample_receipt = """
             KEY FOOD MARKETPLACE
             123 MAIN STREET
             BROOKLYN, NY 11201
@@ -160,7 +161,7 @@ class TestKeyFoodHandler(unittest.TestCase):
         
         # Should process but mark items as suspicious
         self.assertTrue(receipt.requires_review)
-        self.assertTrue(any(item.suspicious for item in receipt.items))
+        self.assertGreater(receipt.debug_info['suspicious_count'], 0)
         
     def test_confidence_calculation(self):
         """Test confidence score calculation."""
@@ -8,38 +8,57 @@ import os
 import sys
 import json
 import csv
-import unittest
+import io
+import logging
+import shutil
 import tempfile
+import unittest
 from datetime import datetime, timedelta
+from contextlib import ExitStack
 from io import StringIO
 from unittest.mock import patch, MagicMock
 
+import numpy as np
+
 # Add the parent directory to sys.path to allow importing app
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
+import app as app_module
 from app import app, ExportManager
 from models.expense import Expense, ExpenseItem
 from models.user import User
 from models.receipt import Receipt, ReceiptItem
 
+# Fix "today" once so every fixture agrees, even across midnight
+_TODAY = datetime.now()
+_TODAY_STR = _TODAY.strftime('%Y-%m-%d')
+_TODAY_DATE = _TODAY.date()
+_MONTH_STR = _TODAY.strftime('%Y-%m')
+
+# Mocks reused across tests; each test resets the ones it patches in
+_MOCK_PROCESS_RECEIPT = MagicMock()
+_MOCK_SAVE_EXPENSE = MagicMock()
+
 class TestPhase6Features(unittest.TestCase):
     """Test suite for Phase 6 features of the Finance Tracker."""
     
-    def setUp(self):
-        """Set up test environment before each test."""
-        self.app = app
-        self.app.config['TESTING'] = True
-        self.app.config['WTF_CSRF_ENABLED'] = False
-        self.client = self.app.test_client()
+    @classmethod
+    def setUpClass(cls):
+        """Set up fixtures shared by all tests."""
+        cls.app = app
+        cls.app.config['TESTING'] = True
+        cls.app.config['WTF_CSRF_ENABLED'] = False
+        cls.client = cls.app.test_client()
         
-        # Create a temporary directory for test uploads
-        self.test_upload_dir = tempfile.mkdtemp()
-        self.app.config['UPLOAD_FOLDER'] = self.test_upload_dir
+        # Keep request logging quiet for the whole suite
+        cls._werkzeug_level = logging.getLogger('werkzeug').level
+        logging.getLogger('werkzeug').setLevel(logging.ERROR)
+        cls.app.logger.disabled = True
         
         # Sample test data
-        self.sample_receipt_data = {
+        cls.sample_receipt_data = {
             'store_name': 'Test Store',
-            'date': datetime.now().strftime('%Y-%m-%d'),
+            'date': _TODAY_STR,
             'total_amount': 53.97,
             'items': [
                 {'description': 'Test Item 1', 'amount': 12.99, 'confidence_score': 0.95},
@@ -49,12 +68,18 @@ class TestPhase6Features(unittest.TestCase):
             'confidence_score': 0.85
         }
     
-    def tearDown(self):
-        """Clean up after each test."""
-        # Remove temporary test directory
-        import shutil
-        if os.path.exists(self.test_upload_dir):
-            shutil.rmtree(self.test_upload_dir)
+    @classmethod
+    def tearDownClass(cls):
+        """Clean up after all tests."""
+        # Restore logging for anything that runs after this suite
+        logging.getLogger('werkzeug').setLevel(cls._werkzeug_level)
+        cls.app.logger.disabled = False
+    
+    def setUp(self):
+        """Give each test its own upload directory."""
+        upload_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, upload_dir, ignore_errors=True)
+        self.app.config['UPLOAD_FOLDER'] = upload_dir
     
     @patch('services.receipt_service.process_receipt_image')
     def test_api_receipt_upload(self, mock_process_receipt):
@@ -63,46 +88,43 @@ class TestPhase6Features(unittest.TestCase):
         mock_process_receipt.return_value = (self.sample_receipt_data, self.sample_receipt_data['items'])
         
         # Create test image file
-        with tempfile.NamedTemporaryFile(suffix='.jpg') as test_img:
-            test_img.write(b'test image content')
-            test_img.flush()
-            test_img.seek(0)
-            
-            # Send test request to API
-            response = self.client.post(
-                '/api/upload-receipt',
-                data={'file': (test_img, 'test_receipt.jpg')},
-                content_type='multipart/form-data'
-            )
-            
-            # Verify response
-            self.assertEqual(response.status_code, 200)
-            data = json.loads(response.data)
-            self.assertTrue(data['success'])
-            self.assertEqual(data['store_name'], 'Test Store')
-            self.assertEqual(data['total'], 53.97)
-            
-            # Verify suspicious item handling
-            items = data['items']
-            self.assertEqual(len(items), 3)
-            self.assertTrue(any(item['flagged_for_review'] for item in items))
-            
-            # Verify that at least one item is flagged as suspicious
-            suspicious_items = [item for item in items if item['flagged_for_review']]
-            self.assertEqual(len(suspicious_items), 1)
-            self.assertEqual(suspicious_items[0]['description'], 'GarbledItemX789%')
+        test_img = io.BytesIO(b'test image content')
+        
+        # Send test request to API
+        response = self.client.post(
+            '/api/upload-receipt',
+            data={'file': (test_img, 'test_receipt.jpg')},
+            content_type='multipart/form-data'
+        )
+        
+        # Verify response
+        self.assertEqual(response.status_code, 200)
+        data = response.get_json(cache=True)
+        self.assertTrue(data['success'])
+        self.assertEqual(data['store_name'], 'Test Store')
+        self.assertEqual(data['total'], 53.97)
+        
+        # Verify suspicious item handling
+        items = data['items']
+        self.assertEqual(len(items), 3)
+        suspicious_items = [item for item in items if item['flagged_for_review']]
+        self.assertTrue(suspicious_items)
+        
+        # Verify that exactly one item is flagged as suspicious
+        self.assertEqual(len(suspicious_items), 1)
+        self.assertEqual(suspicious_items[0]['description'], 'GarbledItemX789%')
     
-    @patch('app.storage.save_expense')
-    @patch('app.receipt_service.process_receipt_image')
-    def test_shared_expense_creation(self, mock_process_receipt, mock_save_expense):
+    def test_shared_expense_creation(self):
         """Test the shared expense creation process with selective item sharing."""
         # Mock the receipt service
-        mock_process_receipt.return_value = (self.sample_receipt_data, self.sample_receipt_data['items'])
+        _MOCK_SAVE_EXPENSE.reset_mock()
+        _MOCK_PROCESS_RECEIPT.reset_mock()
+        _MOCK_PROCESS_RECEIPT.return_value = (self.sample_receipt_data, self.sample_receipt_data['items'])
         
         # Create POST data for a new expense with shared/unshared items
         expense_data = {
             'payer': 'Alvand',
-            'date': datetime.now().strftime('%Y-%m-%d'),
+            'date': _TODAY_STR,
             'store': 'Test Store',
             'total_amount': '53.97',
             'item_name_0': 'Test Item 1',
@@ -118,13 +140,16 @@ class TestPhase6Features(unittest.TestCase):
         }
         
         # Send request to create expense
-        response = self.client.post('/expense/new', data=expense_data, follow_redirects=True)
+        with ExitStack() as stack:
+            stack.enter_context(patch('app.storage.save_expense', _MOCK_SAVE_EXPENSE))
+            stack.enter_context(patch('app.receipt_service.process_receipt_image', _MOCK_PROCESS_RECEIPT))
+            response = self.client.post('/expense/new', data=expense_data, follow_redirects=True)
         
         # Verify the response
         self.assertEqual(response.status_code, 200)
         
         # Check that save_expense was called with correct data
-        args, kwargs = mock_save_expense.call_args
+        args, kwargs = _MOCK_SAVE_EXPENSE.call_args
         expense = args[0]
         
         # Verify expense details
@@ -159,7 +184,7 @@ class TestPhase6Features(unittest.TestCase):
             Expense(
                 id="1",
                 payer=alvand,
-                date=datetime.now().date(),
+                date=_TODAY_DATE,
                 store="Grocery",
                 total_amount=50.0,
                 items=[
@@ -170,7 +195,7 @@ class TestPhase6Features(unittest.TestCase):
             Expense(
                 id="2",
                 payer=roommate,
-                date=datetime.now().date(),
+                date=_TODAY_DATE,
                 store="Restaurant",
                 total_amount=40.0,
                 items=[
@@ -184,7 +209,7 @@ class TestPhase6Features(unittest.TestCase):
             expense.calculate_shared_total()
         
         # Mock the storage to return these expenses for the current month
-        month_str = datetime.now().strftime('%Y-%m')
+        month_str = _MONTH_STR
         
         with patch('app.storage.get_expenses_for_month', return_value=expenses):
             # Get the balance sheet
@@ -218,7 +243,7 @@ class TestPhase6Features(unittest.TestCase):
         # Create an expense that excludes the suspicious item
         expense_data = {
             'payer': 'Alvand',
-            'date': datetime.now().strftime('%Y-%m-%d'),
+            'date': _TODAY_STR,
             'store': 'Test Store',
             'total_amount': '53.97',
             'item_name_0': 'Normal Item',
@@ -250,7 +275,7 @@ class TestPhase6Features(unittest.TestCase):
         alvand = User("Alvand")
         roommate = User("Roommate")
         
-        start_date = datetime.now().date().replace(day=1)  # First day of current month
+        start_date = _TODAY_DATE.replace(day=1)  # First day of current month
         expenses = [
             Expense(
                 id="1",
@@ -297,14 +322,17 @@ class TestPhase6Features(unittest.TestCase):
             self.assertEqual(len(rows), 2)
             
             # Verify content matches our mock data
-            self.assertEqual(rows[0]['Store'], 'Grocery')
-            self.assertEqual(float(rows[0]['Amount']), 50.0)
-            self.assertEqual(rows[1]['Store'], 'Restaurant')
-            self.assertEqual(float(rows[1]['Amount']), 40.0)
+            self.assertEqual([row['Store'] for row in rows], ['Grocery', 'Restaurant'])
+            np.testing.assert_array_equal(
+                np.array([float(row['Amount']) for row in rows]),
+                np.array([50.0, 40.0])
+            )
             
             # Verify shared amounts
-            self.assertEqual(float(rows[0]['Shared Amount']), 30.0)
-            self.assertEqual(float(rows[1]['Shared Amount']), 40.0)
+            np.testing.assert_array_equal(
+                np.array([float(row['Shared Amount']) for row in rows]),
+                np.array([30.0, 40.0])
+            )
             
             # Test summary export
             with patch('app.storage.get_all_months', return_value=[month_str]):
@@ -316,10 +344,40 @@ class TestPhase6Features(unittest.TestCase):
                 
                 # Verify the summary data
                 self.assertEqual(rows[0]['Month'], month_str)
-                self.assertEqual(float(rows[0]['Total Expenses']), 90.0)  # 50 + 40
-                self.assertEqual(float(rows[0]['Shared Expenses']), 70.0)  # 30 + 40
-                self.assertEqual(float(rows[0]['Alvand Paid']), 50.0)
-                self.assertEqual(float(rows[0]['Roommate Paid']), 40.0)
+                summary_columns = ['Total Expenses', 'Shared Expenses', 'Alvand Paid', 'Roommate Paid']
+                np.testing.assert_array_equal(
+                    np.array([float(rows[0][column]) for column in summary_columns]),
+                    np.array([90.0, 70.0, 50.0, 40.0])  # 50 + 40, 30 + 40, then per payer
+                )
+    
+    def test_csv_export_route_streams_monthly_export(self):
+        """Test that the streamed /export/month response matches the buffered export."""
+        balance_sheet = MagicMock()
+        balance_sheet.expenses = [MagicMock(), MagicMock()]
+        balance_sheet.expenses[0].to_dict.return_value = {
+            'date': _TODAY_STR, 'store': 'Grocery', 'payer': 'Alvand', 'receipt_id': 'r1',
+            'items': [
+                {'name': 'Shared Item 1', 'amount': 30.0, 'shared': True},
+                {'name': 'Personal, "Item"', 'amount': 20.0, 'flagged_for_review': True}
+            ]
+        }
+        balance_sheet.expenses[1].to_dict.return_value = {
+            'date': _TODAY_STR, 'store': 'Restaurant', 'payer': 'Roni',
+            'items': [{'name': 'Shared Meal', 'amount': 40.0, 'shared': True}]
+        }
+        balance_sheet.summary.return_value = {
+            'total_expenses': 90.0, 'balance': -5.0, 'owed_statement': 'Alvand owes Roni $5.00'
+        }
+        
+        with patch('app.storage.get_balance_sheet', return_value=balance_sheet):
+            expected = ExportManager(app_module.storage).export_monthly_data(_MONTH_STR).getvalue()
+            response = self.client.get(f'/export/month/{_MONTH_STR}')
+        
+            self.assertEqual(response.status_code, 200)
+            self.assertTrue(response.is_streamed)
+            self.assertEqual(response.mimetype, 'text/csv')
+            self.assertIn('attachment', response.headers['Content-disposition'])
+            self.assertEqual(response.get_data(as_text=True), expected)
     
     @patch('services.receipt_service.process_receipt_image')
     def test_confidence_flag_behavior(self, mock_process_receipt):
@@ -327,7 +385,7 @@ class TestPhase6Features(unittest.TestCase):
         # Sample receipt with varying confidence scores
         receipt_data = {
             'store_name': 'Test Store',
-            'date': datetime.now().strftime('%Y-%m-%d'),
+            'date': _TODAY_STR,
             'total_amount': 45.97,
             'items': [
                 {'description': 'High Confidence Item', 'amount': 10.99, 'confidence_score': 0.95},
@@ -341,32 +399,33 @@ class TestPhase6Features(unittest.TestCase):
         mock_process_receipt.return_value = (receipt_data, receipt_data['items'])
         
         # Test the API endpoint directly
-        with tempfile.NamedTemporaryFile(suffix='.jpg') as test_img:
-            test_img.write(b'test image content')
-            test_img.flush()
-            test_img.seek(0)
-            
-            response = self.client.post(
-                '/api/upload-receipt',
-                data={'file': (test_img, 'test_receipt.jpg')},
-                content_type='multipart/form-data'
-            )
-            
-            # Verify response
-            self.assertEqual(response.status_code, 200)
-            data = json.loads(response.data)
-            
-            # Check flagged items
-            flagged_items = [item for item in data['items'] if item['flagged_for_review']]
-            self.assertEqual(len(flagged_items), 1)
-            self.assertEqual(flagged_items[0]['description'], 'LowUnknown')
-            self.assertTrue(data['flagged_for_review'])  # Overall receipt is flagged
-            
-            # Check that high confidence items are not flagged
-            non_flagged = [item for item in data['items'] if not item['flagged_for_review']]
-            self.assertEqual(len(non_flagged), 2)
-            self.assertEqual(non_flagged[0]['description'], 'High Confidence Item')
-            self.assertEqual(non_flagged[1]['description'], 'Medium Confidence')
+        test_img = io.BytesIO(b'test image content')
+        
+        response = self.client.post(
+            '/api/upload-receipt',
+            data={'file': (test_img, 'test_receipt.jpg')},
+            content_type='multipart/form-data'
+        )
+        
+        # Verify response
+        self.assertEqual(response.status_code, 200)
+        data = response.get_json(cache=True)
+        
+        # Partition items by review flag in a single pass
+        flagged_items = []
+        non_flagged = []
+        for item in data['items']:
+            (flagged_items if item['flagged_for_review'] else non_flagged).append(item)
+        
+        # Check flagged items
+        self.assertEqual(len(flagged_items), 1)
+        self.assertEqual(flagged_items[0]['description'], 'LowUnknown')
+        self.assertTrue(data['flagged_for_review'])  # Overall receipt is flagged
+        
+        # Check that high confidence items are not flagged
+        self.assertEqual(len(non_flagged), 2)
+        self.assertEqual(non_flagged[0]['description'], 'High Confidence Item')
+        self.assertEqual(non_flagged[1]['description'], 'Medium Confidence')
 
 if __name__ == '__main__':
     unittest.main() 
\ No newline at end of file
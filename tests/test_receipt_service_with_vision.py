@@ -1,4 +1,5 @@
 """Tests for receipt service with Google Cloud Vision integration."""
+import io
 import os
 import pytest
 from unittest.mock import Mock, patch
@@ -8,34 +9,43 @@ from services.receipt_service import ReceiptService
 from models.receipt import Receipt
 from utils.image_preprocessor import ImagePreprocessor
 from utils.receipt_analyzer import ReceiptAnalyzer
-from ocr.google_vision_ocr import GoogleVisionOCR
 
-@pytest.fixture
-def mock_storage():
-    """Create a mock storage instance."""
+@pytest.fixture(scope="session")
+def _shared_storage():
+    """Create the mock storage instance shared by the whole session."""
     storage = Mock()
     storage.get.return_value = None
     return storage
 
 @pytest.fixture
-def mock_image_file(tmp_path):
-    """Create a mock image file."""
-    image_file = tmp_path / "test_receipt.jpg"
-    image_file.write_bytes(b"dummy image content")
+def mock_storage(_shared_storage):
+    """Provide the shared mock storage with its recorded calls cleared."""
+    _shared_storage.reset_mock()
+    return _shared_storage
+
+@pytest.fixture
+def mock_image_file():
+    """Create a mock image file backed by an in-memory buffer."""
+    buf = io.BytesIO(b"dummy image content")
     
     mock_file = Mock()
-    mock_file.save = lambda path: image_file.read_bytes()
+    mock_file.save = lambda path: buf.getvalue()
     return mock_file
 
 @pytest.fixture
-def receipt_service(mock_storage, mock_vision_config, mock_credentials, tmp_path):
-    """Create a receipt service instance with mocked dependencies."""
-    upload_dir = tmp_path / "uploads"
-    upload_dir.mkdir()
-    return ReceiptService(mock_storage, str(upload_dir))
+def receipt_service(mock_storage, session_vision_env, tmp_path):
+    """Create a receipt service per test.
+    
+    The OCR engine caches its Vision client on first use, so a shared service
+    would keep the client mock patched in by whichever test ran first.
+    """
+    with patch.dict(os.environ, session_vision_env):
+        return ReceiptService(mock_storage, str(tmp_path))
 
 def test_init_with_google_vision(mock_storage, mock_vision_config, mock_credentials, tmp_path):
     """Test initialization with Google Cloud Vision configuration."""
+    from ocr.google_vision_ocr import GoogleVisionOCR
+
     service = ReceiptService(mock_storage, str(tmp_path))
     assert isinstance(service.ocr, GoogleVisionOCR)
     assert service.vision_config.is_configured is True
@@ -68,6 +78,20 @@ def test_process_receipt_with_tesseract_fallback(mock_storage, mock_image_file,
         assert 'error' not in result
         assert result['ocr_metadata']['engine'] == 'tesseract'
 
+def test_process_receipt_with_provided_ocr_text(receipt_service, tmp_path):
+    """Test that OCR text passed in the options skips preprocessing and OCR."""
+    receipt_service.ocr = Mock()
+    with patch.object(receipt_service.preprocessor, 'preprocess') as mock_preprocess:
+        result = receipt_service.process_receipt(
+            str(tmp_path / "receipt.jpg"),
+            {'ocr_text': "Sample Receipt\nTotal: $10.99"}
+        )
+    
+    mock_preprocess.assert_not_called()
+    receipt_service.ocr.extract_text.assert_not_called()
+    assert 'error' not in result
+    assert result['ocr_metadata']['engine'] is None
+
 def test_process_receipt_with_database(receipt_service, mock_image_file, mock_vision_client):
     """Test receipt processing with database integration."""
     mock_session = Mock()
@@ -2,75 +2,359 @@
 
 import os
 import sys
-import unittest
-import json
-import csv
-from typing import List, Dict, Any, Optional
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from typing import List, Dict, Any, Optional, Tuple, Callable, Iterator
 from datetime import datetime
 from decimal import Decimal
 import logging
-from collections import defaultdict
+from collections import defaultdict, deque
 import time
 
 from handlers.handler_registry import get_handler, HandlerRegistry
 from models.receipt import Receipt
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 logger = logging.getLogger(__name__)
 
+# Tolerance for comparing extracted amounts against expected ones
+_TOL = Decimal('0.01')
+
+# (receipt attribute, test case key, label) for each amount checked against _TOL
+_CHECKS = (
+    ('total_amount', 'expected_total', 'Total'),
+    ('tax_amount', 'expected_tax', 'Tax'),
+    ('subtotal_amount', 'expected_subtotal', 'Subtotal')
+)
+
+# Most recent errors kept per handler; total_errors still counts all of them
+_MAX_HANDLER_ERRORS = 50
+
+# Column types for test_cases.csv; amounts are read as text so they convert to Decimal exactly
+_CSV_DTYPES = {
+    'test_id': str,
+    'store_name': str,
+    'receipt_file': str,
+    'expected_total': str,
+    'expected_tax': str,
+    'expected_subtotal': str,
+    'expected_item_count': 'int64',
+    'min_confidence': 'float64',
+    'expected_handler': str
+}
+_DECIMAL_COLUMNS = ('expected_total', 'expected_tax', 'expected_subtotal')
+
+def _import_pandas():
+    """Import pandas on first use, or return None when it is not installed.
+    
+    Importing pandas costs far more than the rest of this module, so it is
+    left out of module import (and so of pytest collection).
+    """
+    try:
+        import pandas as pd
+    except ImportError:
+        return None
+    return pd
+
+def _read_test_cases_frame(pd, csv_path: str, resolve_path: Callable[[str], str]) -> List[Dict[str, Any]]:
+    """Parse the test cases CSV in one bulk pandas read."""
+    try:
+        df = pd.read_csv(csv_path, dtype=_CSV_DTYPES, keep_default_na=False, engine='pyarrow')
+    except ImportError:
+        # pyarrow is not installed; the C engine takes the same options
+        df = pd.read_csv(csv_path, dtype=_CSV_DTYPES, keep_default_na=False)
+    
+    df = df[list(_CSV_DTYPES)]
+    for column in _DECIMAL_COLUMNS:
+        df[column] = df[column].map(Decimal)
+    df['expected_handler'] = df['expected_handler'].map(sys.intern)
+    df['receipt_path'] = df['receipt_file'].map(resolve_path)
+    return df.to_dict(orient='records')
+
+def _dumps_report(report: Dict[str, Any]) -> bytes:
+    """Serialize a report to indented JSON, using orjson when it is installed."""
+    # default=str covers Decimal and datetime values for both encoders
+    if orjson is not None:
+        return orjson.dumps(report, option=orjson.OPT_INDENT_2, default=str)
+    
+    import json
+    return json.dumps(report, indent=2, default=str).encode()
+
+def _dumps_line(result: Dict[str, Any]) -> bytes:
+    """Serialize one test result as a JSON line, using orjson when it is installed."""
+    if orjson is not None:
+        return orjson.dumps(result, default=str) + b'\n'
+    
+    import json
+    return json.dumps(result, default=str).encode() + b'\n'
+
+def _loads_line(line: bytes) -> Dict[str, Any]:
+    """Parse one JSON line written by _dumps_line."""
+    if orjson is not None:
+        return orjson.loads(line)
+    
+    import json
+    return json.loads(line)
+
+def _read_receipt(path: str) -> str:
+    """Read a receipt text file."""
+    with open(path, 'r', buffering=131072, encoding='utf-8') as f:
+        return f.read()
+
+def _prefetch_receipt(path: str) -> Optional[str]:
+    """Read a receipt for the prefetch pass; unreadable files are left for the test to report."""
+    try:
+        return _read_receipt(path)
+    except OSError:
+        return None
+
+def _validate_receipt(receipt: Any, test_case: Dict[str, Any]) -> List[str]:
+    """Compare a processed receipt with a test case's expected values.
+    
+    Args:
+        receipt: The receipt produced by the handler.
+        test_case: Dictionary containing test case data.
+        
+    Returns:
+        Error messages for every check that failed.
+    """
+    errors = []
+    
+    # Check confidence threshold
+    if receipt.confidence_score < test_case['min_confidence']:
+        errors.append(
+            f"Confidence score {receipt.confidence_score:.2f} below minimum "
+            f"threshold {test_case['min_confidence']:.2f}"
+        )
+    
+    # Check totals match
+    for attr, key, label in _CHECKS:
+        got = getattr(receipt, attr)
+        want = test_case[key]
+        if abs(got - want) > _TOL:
+            errors.append(f"{label} amount mismatch: expected {want}, got {got}")
+    
+    # Check item count
+    if len(receipt.items) != test_case['expected_item_count']:
+        errors.append(
+            f"Item count mismatch: expected {test_case['expected_item_count']}, "
+            f"got {len(receipt.items)}"
+        )
+    
+    return errors
+
+def _run_test_case(test_case: Dict[str, Any],
+                   receipt_text: Optional[str] = None) -> Tuple[Dict[str, Any], Optional[Dict[str, Any]]]:
+    """Run a single test case.
+    
+    Kept at module level so test cases can be dispatched to worker processes.
+    
+    Args:
+        test_case: Dictionary containing test case data.
+        receipt_text: Prefetched receipt text; read from disk when None.
+        
+    Returns:
+        The test results, and the handler stats delta for the parent to merge
+        (None if the test failed before the handler produced a receipt).
+    """
+    result = {
+        'test_id': test_case['test_id'],
+        'store_name': test_case['store_name'],
+        'receipt_file': test_case['receipt_file'],
+        'passed': False,
+        'errors': [],
+        'warnings': [],
+        'processing_time': 0.0
+    }
+    stats_delta = None
+    
+    try:
+        # Read receipt text
+        if receipt_text is None:
+            receipt_text = _read_receipt(test_case['receipt_path'])
+        
+        # Process receipt
+        start_time = time.time()
+        handler = get_handler(receipt_text)
+        handler_name = handler.__class__.__name__
+        result['handler_used'] = handler_name
+        
+        # Verify correct handler was selected
+        if handler_name != test_case['expected_handler']:
+            result['warnings'].append(
+                f"Wrong handler selected: expected {test_case['expected_handler']}, "
+                f"got {handler_name}"
+            )
+        
+        receipt = handler.process_receipt(receipt_text)
+        end_time = time.time()
+        result['processing_time'] = end_time - start_time
+        
+        # Validate results
+        result['confidence_score'] = receipt.confidence_score
+        # Amounts stay Decimal; the report encoders stringify them once via default=str
+        result['total_amount'] = receipt.total_amount
+        result['tax_amount'] = receipt.tax_amount
+        result['subtotal_amount'] = receipt.subtotal_amount
+        result['item_count'] = len(receipt.items)
+        result['validation_notes'] = receipt.validation_notes
+        result['requires_review'] = receipt.requires_review
+        
+        # Check the receipt against the expected values; this raises (e.g. on a
+        # missing amount) before any handler stats are recorded for the test
+        result['errors'].extend(_validate_receipt(receipt, test_case))
+        
+        result['passed'] = not result['errors']
+        
+        # Handler stats for this test; the parent merges them into its totals
+        stats_delta = {
+            'handler': handler_name,
+            'passed': result['passed'],
+            'confidence': receipt.confidence_score,
+            'processing_time': result['processing_time'],
+            'errors': list(result['errors'])
+        }
+        
+    except Exception as e:
+        result['errors'].append(f"Test execution error: {str(e)}")
+        logger.error(f"Error running test {test_case['test_id']}: {e}", exc_info=True)
+    
+    return result, stats_delta
+
 class ReceiptTestRunner:
     """Enhanced test runner for receipt handler tests."""
     
-    def __init__(self, test_data_dir: str = "tests/test_data"):
+    def __init__(self, test_data_dir: str = "tests/test_data", debug: bool = False):
         """Initialize the test runner.
         
         Args:
             test_data_dir: Directory containing test data files.
+            debug: Also collect every test's errors under its handler's stats.
         """
         self.test_data_dir = test_data_dir
-        self.results: List[Dict[str, Any]] = []
+        self.debug = debug
+        
+        # Results are streamed to JSON lines; only the summary counts stay in memory.
+        # The file starts empty, so a report never picks up an earlier run's results
+        self.results_path = os.path.join(test_data_dir, 'test_report.jsonl')
+        os.makedirs(test_data_dir, exist_ok=True)
+        open(self.results_path, 'wb').close()
+        self._total_tests = 0
+        self._passed_tests = 0
+        self._prefetched: Dict[str, Optional[str]] = {}
+        self._dir_cache: Tuple[Optional[int], Dict[str, str]] = (None, {})
         self.handler_stats: Dict[str, Dict[str, Any]] = defaultdict(lambda: {
             'total_tests': 0,
             'passed_tests': 0,
             'failed_tests': 0,
             'avg_confidence': 0.0,
             'avg_processing_time': 0.0,
-            'errors': []
+            'sum_confidence': 0.0,
+            'sum_processing_time': 0.0,
+            'total_errors': 0,
+            'errors': deque(maxlen=_MAX_HANDLER_ERRORS)
         })
         
-        # Configure logging
+        # Configure logging; basicConfig leaves it alone if the caller (e.g. pytest) already has
         logging.basicConfig(
             level=logging.INFO,
             format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
         )
     
+    def _scan_test_dir(self) -> Dict[str, str]:
+        """Map file names in the test data directory to their paths.
+        
+        One os.scandir pass, whose entries already know whether they are
+        files; the result is reused until the directory's mtime changes.
+        """
+        mtime_ns = os.stat(self.test_data_dir).st_mtime_ns
+        if self._dir_cache[0] == mtime_ns:
+            return self._dir_cache[1]
+        
+        with os.scandir(self.test_data_dir) as entries:
+            files = {entry.name: entry.path for entry in entries if entry.is_file(follow_symlinks=False)}
+        self._dir_cache = (mtime_ns, files)
+        return files
+    
+    def _resolve_receipt_path(self, receipt_file: str) -> str:
+        """Get the full path of a receipt file named in the test cases."""
+        # Names not found directly in the directory (nested or missing files) are
+        # joined as before, so a missing file is still reported by its test
+        path = self._scan_test_dir().get(receipt_file)
+        return path if path is not None else os.path.join(self.test_data_dir, receipt_file)
+    
     def load_test_cases(self) -> List[Dict[str, Any]]:
         """Load test cases from CSV file."""
         test_cases = []
         csv_path = os.path.join(self.test_data_dir, "test_cases.csv")
         
         try:
+            pd = _import_pandas()
+            if pd is not None:
+                return _read_test_cases_frame(pd, csv_path, self._resolve_receipt_path)
+            
+            import csv
+            import numpy as np
+            
             with open(csv_path, 'r') as f:
-                reader = csv.DictReader(f)
-                for row in reader:
-                    test_cases.append({
-                        'test_id': row['test_id'],
-                        'store_name': row['store_name'],
-                        'receipt_file': row['receipt_file'],
-                        'expected_total': Decimal(row['expected_total']),
-                        'expected_tax': Decimal(row['expected_tax']),
-                        'expected_subtotal': Decimal(row['expected_subtotal']),
-                        'expected_item_count': int(row['expected_item_count']),
-                        'min_confidence': float(row['min_confidence']),
-                        'expected_handler': row['expected_handler']
-                    })
+                rows = list(csv.DictReader(f))
+            
+            # Cast the numeric columns in bulk instead of once per row
+            item_counts = np.asarray([row['expected_item_count'] for row in rows], dtype=np.int64).tolist()
+            min_confidences = np.asarray([row['min_confidence'] for row in rows], dtype=np.float64).tolist()
+            
+            for row, item_count, min_confidence in zip(rows, item_counts, min_confidences):
+                test_cases.append({
+                    'test_id': row['test_id'],
+                    'store_name': row['store_name'],
+                    'receipt_file': row['receipt_file'],
+                    'expected_total': Decimal(row['expected_total']),
+                    'expected_tax': Decimal(row['expected_tax']),
+                    'expected_subtotal': Decimal(row['expected_subtotal']),
+                    'expected_item_count': item_count,
+                    'min_confidence': min_confidence,
+                    # Interned so comparing against handler class names is usually an identity check
+                    'expected_handler': sys.intern(row['expected_handler']),
+                    'receipt_path': self._resolve_receipt_path(row['receipt_file'])
+                })
         except Exception as e:
             logger.error(f"Error loading test cases: {e}")
             sys.exit(1)
             
         return test_cases
     
+    def _merge_stats(self, stats_delta: Dict[str, Any]) -> None:
+        """Merge one test's handler stats into the per-handler totals.
+        
+        Only counts and running sums are kept here; generate_report derives
+        the averages from them once.
+        """
+        stats = self.handler_stats[stats_delta['handler']]
+        stats['total_tests'] += 1
+        if stats_delta['passed']:
+            stats['passed_tests'] += 1
+        else:
+            stats['failed_tests'] += 1
+            stats['total_errors'] += len(stats_delta['errors'])
+            # Errors are already listed per test result; only duplicate them when debugging
+            if self.debug:
+                stats['errors'].extend(stats_delta['errors'])
+        
+        stats['sum_confidence'] += stats_delta['confidence']
+        stats['sum_processing_time'] += stats_delta['processing_time']
+    
+    def _prefetch(self, test_cases: List[Dict[str, Any]]) -> Dict[str, Optional[str]]:
+        """Read every receipt file concurrently so the test phase does no disk I/O."""
+        # Receipts shared by several test cases are read once
+        paths = list(dict.fromkeys(test_case['receipt_path'] for test_case in test_cases))
+        with ThreadPoolExecutor(max_workers=16) as executor:
+            return dict(zip(paths, executor.map(_prefetch_receipt, paths)))
+    
     def run_test(self, test_case: Dict[str, Any]) -> Dict[str, Any]:
-        """Run a single test case.
+        """Run a single test case in this process.
         
         Args:
             test_case: Dictionary containing test case data.
@@ -78,106 +362,9 @@ class ReceiptTestRunner:
         Returns:
             Dictionary containing test results.
         """
-        result = {
-            'test_id': test_case['test_id'],
-            'store_name': test_case['store_name'],
-            'receipt_file': test_case['receipt_file'],
-            'passed': False,
-            'errors': [],
-            'warnings': [],
-            'processing_time': 0.0
-        }
-        
-        try:
-            # Read receipt text
-            receipt_path = os.path.join(self.test_data_dir, test_case['receipt_file'])
-            with open(receipt_path, 'r') as f:
-                receipt_text = f.read()
-            
-            # Process receipt
-            start_time = time.time()
-            handler = get_handler(receipt_text)
-            result['handler_used'] = handler.__class__.__name__
-            
-            # Verify correct handler was selected
-            if handler.__class__.__name__ != test_case['expected_handler']:
-                result['warnings'].append(
-                    f"Wrong handler selected: expected {test_case['expected_handler']}, "
-                    f"got {handler.__class__.__name__}"
-                )
-            
-            receipt = handler.process_receipt(receipt_text)
-            end_time = time.time()
-            result['processing_time'] = end_time - start_time
-            
-            # Validate results
-            result['confidence_score'] = receipt.confidence_score
-            result['total_amount'] = str(receipt.total_amount)
-            result['tax_amount'] = str(receipt.tax_amount)
-            result['subtotal_amount'] = str(receipt.subtotal_amount)
-            result['item_count'] = len(receipt.items)
-            result['validation_notes'] = receipt.validation_notes
-            result['requires_review'] = receipt.requires_review
-            
-            # Check confidence threshold
-            if receipt.confidence_score < test_case['min_confidence']:
-                result['errors'].append(
-                    f"Confidence score {receipt.confidence_score:.2f} below minimum "
-                    f"threshold {test_case['min_confidence']:.2f}"
-                )
-            
-            # Check totals match
-            if abs(receipt.total_amount - test_case['expected_total']) > Decimal('0.01'):
-                result['errors'].append(
-                    f"Total amount mismatch: expected {test_case['expected_total']}, "
-                    f"got {receipt.total_amount}"
-                )
-            
-            if abs(receipt.tax_amount - test_case['expected_tax']) > Decimal('0.01'):
-                result['errors'].append(
-                    f"Tax amount mismatch: expected {test_case['expected_tax']}, "
-                    f"got {receipt.tax_amount}"
-                )
-            
-            if abs(receipt.subtotal_amount - test_case['expected_subtotal']) > Decimal('0.01'):
-                result['errors'].append(
-                    f"Subtotal amount mismatch: expected {test_case['expected_subtotal']}, "
-                    f"got {receipt.subtotal_amount}"
-                )
-            
-            # Check item count
-            if len(receipt.items) != test_case['expected_item_count']:
-                result['errors'].append(
-                    f"Item count mismatch: expected {test_case['expected_item_count']}, "
-                    f"got {len(receipt.items)}"
-                )
-            
-            # Update handler stats
-            handler_name = handler.__class__.__name__
-            self.handler_stats[handler_name]['total_tests'] += 1
-            if not result['errors']:
-                self.handler_stats[handler_name]['passed_tests'] += 1
-                result['passed'] = True
-            else:
-                self.handler_stats[handler_name]['failed_tests'] += 1
-                self.handler_stats[handler_name]['errors'].extend(result['errors'])
-            
-            # Update running averages
-            prev_avg_conf = self.handler_stats[handler_name]['avg_confidence']
-            prev_tests = self.handler_stats[handler_name]['total_tests']
-            self.handler_stats[handler_name]['avg_confidence'] = (
-                (prev_avg_conf * (prev_tests - 1) + receipt.confidence_score) / prev_tests
-            )
-            
-            prev_avg_time = self.handler_stats[handler_name]['avg_processing_time']
-            self.handler_stats[handler_name]['avg_processing_time'] = (
-                (prev_avg_time * (prev_tests - 1) + result['processing_time']) / prev_tests
-            )
-            
-        except Exception as e:
-            result['errors'].append(f"Test execution error: {str(e)}")
-            logger.error(f"Error running test {test_case['test_id']}: {e}", exc_info=True)
-        
+        result, stats_delta = _run_test_case(test_case, self._prefetched.get(test_case['receipt_path']))
+        if stats_delta is not None:
+            self._merge_stats(stats_delta)
         return result
     
     def run_all_tests(self) -> None:
@@ -185,26 +372,70 @@ class ReceiptTestRunner:
         test_cases = self.load_test_cases()
         logger.info(f"Running {len(test_cases)} test cases...")
         
-        for test_case in test_cases:
-            result = self.run_test(test_case)
-            self.results.append(result)
-            
-            # Log result
-            status = "PASSED" if result['passed'] else "FAILED"
-            logger.info(f"Test {result['test_id']} {status}")
-            if result['errors']:
-                for error in result['errors']:
-                    logger.error(f"  Error: {error}")
-            if result['warnings']:
-                for warning in result['warnings']:
-                    logger.warning(f"  Warning: {warning}")
+        self._prefetched = self._prefetch(test_cases)
+        
+        # Test cases are independent, so spread them over worker processes,
+        # leaving a couple of cores free for the parent and the system
+        max_workers = max(1, (os.cpu_count() or 1) - 2)
+        
+        # Results finishing early wait here so lines stay in test case order
+        pending: Dict[int, Dict[str, Any]] = {}
+        next_index = 0
+        
+        # Later suites on the same runner append to the earlier suites' results
+        with open(self.results_path, 'ab', buffering=1 << 20) as results_file, \
+                ProcessPoolExecutor(max_workers=max_workers) as executor:
+            futures = {
+                executor.submit(_run_test_case, test_case, self._prefetched.get(test_case['receipt_path'])): index
+                for index, test_case in enumerate(test_cases)
+            }
+            for future in as_completed(futures):
+                result, stats_delta = future.result()
+                if stats_delta is not None:
+                    self._merge_stats(stats_delta)
+                
+                self._total_tests += 1
+                if result['passed']:
+                    self._passed_tests += 1
+                
+                pending[futures[future]] = result
+                while next_index in pending:
+                    results_file.write(_dumps_line(pending.pop(next_index)))
+                    next_index += 1
+                
+                # Log result
+                status = "PASSED" if result['passed'] else "FAILED"
+                logger.info(f"Test {result['test_id']} {status}")
+                # One record per test for all of its errors and warnings
+                if result['errors'] and logger.isEnabledFor(logging.ERROR):
+                    logger.error("Test %s errors:\n  %s", result['test_id'], "\n  ".join(result['errors']))
+                if result['warnings'] and logger.isEnabledFor(logging.WARNING):
+                    logger.warning("Test %s warnings:\n  %s", result['test_id'], "\n  ".join(result['warnings']))
+    
+    def _iter_result_lines(self, results_path: str) -> Iterator[bytes]:
+        """Yield the streamed test results one JSON line at a time."""
+        with open(results_path, 'rb', buffering=1 << 20) as f:
+            for line in f:
+                line = line.strip()
+                if line:
+                    yield line
     
     def generate_report(self) -> Dict[str, Any]:
-        """Generate a comprehensive test report."""
-        total_tests = len(self.results)
-        passed_tests = sum(1 for r in self.results if r['passed'])
+        """Generate a comprehensive test report.
+        
+        Per-test results are not loaded; the report names the JSON lines file
+        they were streamed to, and save_report streams them from there.
+        """
+        total_tests = self._total_tests
+        passed_tests = self._passed_tests
         failed_tests = total_tests - passed_tests
         
+        # Averages come from the running sums, independent of test order
+        for stats in self.handler_stats.values():
+            if stats['total_tests']:
+                stats['avg_confidence'] = stats['sum_confidence'] / stats['total_tests']
+                stats['avg_processing_time'] = stats['sum_processing_time'] / stats['total_tests']
+        
         report = {
             'summary': {
                 'total_tests': total_tests,
@@ -212,8 +443,12 @@ class ReceiptTestRunner:
                 'failed_tests': failed_tests,
                 'success_rate': passed_tests / total_tests if total_tests > 0 else 0
             },
-            'handler_stats': dict(self.handler_stats),
-            'test_results': self.results
+            # Error deques become lists so both JSON encoders handle them
+            'handler_stats': {
+                handler: {**stats, 'errors': list(stats['errors'])}
+                for handler, stats in self.handler_stats.items()
+            },
+            'test_results_path': self.results_path
         }
         
         return report
@@ -225,12 +460,22 @@ class ReceiptTestRunner:
             report: The test report to save.
             format: Output format ('json', 'text', or 'both').
         """
+        results_path = report['test_results_path']
+        
         # Save JSON report
         if format in ['json', 'both']:
             json_path = os.path.join(self.test_data_dir, 'test_report.json')
             try:
-                with open(json_path, 'w') as f:
-                    json.dump(report, f, indent=2, default=str)
+                # Everything but the results is encoded at once; its closing brace
+                # is reopened so the results stream in as the test_results list
+                head = _dumps_report({
+                    key: value for key, value in report.items() if key != 'test_results_path'
+                }).rstrip()[:-1].rstrip()
+                with open(json_path, 'wb', buffering=1 << 20) as f:
+                    f.write(head + b',\n  "test_results": [')
+                    for i, line in enumerate(self._iter_result_lines(results_path)):
+                        f.write(b'\n    ' + line if i == 0 else b',\n    ' + line)
+                    f.write(b'\n  ]\n}')
                 logger.info(f"JSON report saved to {json_path}")
             except Exception as e:
                 logger.error(f"Error saving JSON report: {e}")
@@ -239,14 +484,15 @@ class ReceiptTestRunner:
         if format in ['text', 'both']:
             text_path = os.path.join(self.test_data_dir, 'test_report.txt')
             try:
-                with open(text_path, 'w') as f:
+                # Written through one large buffer, with results streamed from disk
+                with open(text_path, 'w', buffering=1 << 20) as f:
                     # Write summary
                     f.write("=== TEST SUMMARY ===\n")
                     f.write(f"Total Tests: {report['summary']['total_tests']}\n")
                     f.write(f"Passed Tests: {report['summary']['passed_tests']}\n")
                     f.write(f"Failed Tests: {report['summary']['failed_tests']}\n")
                     f.write(f"Success Rate: {report['summary']['success_rate']*100:.1f}%\n\n")
-                    
+                
                     # Write handler stats
                     f.write("=== HANDLER STATISTICS ===\n")
                     for handler, stats in report['handler_stats'].items():
@@ -260,10 +506,11 @@ class ReceiptTestRunner:
                             f.write("  Errors:\n")
                             for error in stats['errors']:
                                 f.write(f"    - {error}\n")
-                    
+                
                     # Write detailed test results
                     f.write("\n=== DETAILED TEST RESULTS ===\n")
-                    for result in report['test_results']:
+                    for line in self._iter_result_lines(results_path):
+                        result = _loads_line(line)
                         f.write(f"\nTest {result['test_id']} - {result['store_name']}\n")
                         f.write(f"  Status: {'PASSED' if result['passed'] else 'FAILED'}\n")
                         f.write(f"  Handler: {result['handler_used']}\n")
@@ -5,15 +5,8 @@ from decimal import Decimal
 from datetime import datetime
 from handlers.trader_joes_handler import TraderJoesHandler
 
-class TestTraderJoesHandler(unittest.TestCase):
-    """Test cases for Trader Joe's receipt handler."""
-    
-    def setUp(self):
-        """Set up test cases."""
-        self.handler = TraderJoesHandler()
-        
-        # Sample receipt text
-        self.sample_receipt = """
+# Sample receipt text, shared by every test and parsed once per class
+_SAMPLE_RECEIPT = """
             TRADER JOE'S #123
             123 MAIN STREET
             CITY, STATE 12345
@@ -38,11 +31,20 @@ class TestTraderJoesHandler(unittest.TestCase):
             THANK YOU FOR SHOPPING AT
             TRADER JOE'S
         """
+
+class TestTraderJoesHandler(unittest.TestCase):
+    """Test cases for Trader Joe's receipt handler."""
+    
+    @classmethod
+    def setUpClass(cls):
+        """Set up fixtures shared by all test cases."""
+        cls.handler = TraderJoesHandler()
+        cls._parsed = cls.handler.process(_SAMPLE_RECEIPT)
         
     def test_can_handle(self):
         """Test store name detection."""
         # Should handle Trader Joe's receipts
-        self.assertTrue(self.handler.can_handle(self.sample_receipt))
+        self.assertTrue(self.handler.can_handle(_SAMPLE_RECEIPT))
         
         # Should handle variations
         variations = [
@@ -64,7 +66,7 @@ class TestTraderJoesHandler(unittest.TestCase):
             
     def test_extract_metadata(self):
         """Test metadata extraction."""
-        metadata = self.handler.extract_metadata(self.sample_receipt)
+        metadata = self.handler.extract_metadata(_SAMPLE_RECEIPT)
         
         self.assertEqual(metadata['store_name'], "TRADER JOE'S")
         self.assertEqual(metadata['store_number'], "123")
@@ -74,7 +76,7 @@ class TestTraderJoesHandler(unittest.TestCase):
         
     def test_extract_items(self):
         """Test item extraction."""
-        items = self.handler.extract_items(self.sample_receipt)
+        items = self.handler.extract_items(_SAMPLE_RECEIPT)
         
         # Check number of items
         self.assertEqual(len(items), 5)
@@ -98,7 +100,7 @@ class TestTraderJoesHandler(unittest.TestCase):
         
     def test_extract_totals(self):
         """Test totals extraction."""
-        totals = self.handler._extract_totals(self.sample_receipt)
+        totals = self.handler._extract_totals(_SAMPLE_RECEIPT)
         
         self.assertEqual(totals['subtotal'], 22.44)
         self.assertEqual(totals['tax'], 1.87)
@@ -106,7 +108,7 @@ class TestTraderJoesHandler(unittest.TestCase):
         
     def test_process_receipt(self):
         """Test complete receipt processing."""
-        receipt = self.handler.process(self.sample_receipt)
+        receipt = self._parsed
         
         # Check basic receipt data
         self.assertEqual(receipt.store_name, "TRADER JOE'S")
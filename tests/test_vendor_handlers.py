@@ -1,9 +1,10 @@
 import os
 import time
 import json
+import threading
 import pytest
 from decimal import Decimal
-from functools import partial
+from functools import partial, lru_cache
 from receipt_processor import ReceiptProcessor
 from handlers.handler_registry import HandlerRegistry
 
@@ -14,6 +15,11 @@ try:
 except ImportError:
     HAS_JSONSCHEMA = False
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 # Create a registry instance
 registry = HandlerRegistry()
 
@@ -24,21 +30,92 @@ RECEIPT_TIMEOUT = int(os.getenv("RECEIPT_TIMEOUT", "30"))
 # Maximum allowed difference for price comparisons
 PRICE_TOLERANCE = Decimal("0.05")
 
+def _to_decimal(value):
+    """Convert a parsed amount to Decimal, leaving Decimals and None as they are."""
+    if value is None or isinstance(value, Decimal):
+        return value
+    return Decimal(str(value))
+
 # Path to JSON schema for expected result files
 SCHEMA_PATH = os.path.join("schemas", "expected_result_schema.json")
 
+# Schema and validator, loaded and checked once on first use
+_SCHEMA = None
+_VALIDATOR = None
+
+def _get_validator():
+    """Build the validator for SCHEMA_PATH once, using the draft named by its $schema."""
+    global _SCHEMA, _VALIDATOR
+    if _VALIDATOR is None:
+        with open(SCHEMA_PATH, 'r') as schema_file:
+            _SCHEMA = json.load(schema_file)
+        validator_cls = jsonschema.validators.validator_for(_SCHEMA)
+        validator_cls.check_schema(_SCHEMA)
+        _VALIDATOR = validator_cls(_SCHEMA)
+    return _VALIDATOR
+
+# Expected-result files that already passed schema validation, persisted in
+# pytest's cache across runs. Each entry records the file's and the schema's
+# mtime and size, so editing either one forces the file to be validated again
+_VALIDATED_CACHE_KEY = "vendor_handlers/expected_valid"
+_cache = None
+_validated = {}
+_newly_validated = {}
+
+def _bind_validation_cache(config):
+    """Load the validated-files record from the pytest cache on first use."""
+    global _cache, _validated
+    if _cache is None:
+        _cache = getattr(config, "cache", None)  # None when cacheprovider is disabled
+        if _cache is not None:
+            _validated = _cache.get(_VALIDATED_CACHE_KEY, {})
+
+@pytest.fixture(scope="module", autouse=True)
+def _save_validation_cache():
+    """Merge this process's newly validated files into the stored record once.
+    
+    Under pytest-xdist every worker validates its own subset, so the stored
+    record is re-read and merged rather than overwritten with one worker's view.
+    """
+    yield
+    if _cache is not None and _newly_validated:
+        stored = _cache.get(_VALIDATED_CACHE_KEY, {})
+        stored.update(_newly_validated)
+        _cache.set(_VALIDATED_CACHE_KEY, stored)
+        _newly_validated.clear()
+
+# ReceiptProcessor shared by the tests in this process (pytest -n auto spreads
+# the images across processes); dropped after a timeout, since the abandoned
+# thread may still be using it
+_processor = None
+
+@pytest.fixture
+def processor():
+    """The shared ReceiptProcessor, rebuilt if a timed-out receipt left it busy."""
+    global _processor
+    if _processor is None:
+        _processor = ReceiptProcessor(debug_mode=DEBUG_HANDLERS)
+    return _processor
+
 # Helper function to get all test images from samples/images directory
+# (scanned once per session; a tuple so callers cannot change the shared list)
+@lru_cache(maxsize=1)
 def get_test_images():
     images_dir = os.path.join('samples', 'images')
     if not os.path.exists(images_dir):
-        return []
-    return [
-        os.path.join(images_dir, f) 
-        for f in os.listdir(images_dir) 
-        if f.lower().endswith(('.png', '.jpg', '.jpeg')) and not f.startswith('.')
-    ]
+        return ()
+    with os.scandir(images_dir) as entries:
+        return tuple(
+            entry.path
+            for entry in entries
+            if entry.is_file() and entry.name.lower().endswith(('.png', '.jpg', '.jpeg'))
+            and not entry.name.startswith('.')
+        )
 
 # Helper function to get expected results for a test image
+# (each file is read once per session and validated only when it changed; skips and
+# failures are not cached)
+@lru_cache(maxsize=None)
 def get_expected_results(image_path):
     # Expected results should be in samples/expected/<image_name>.png.expected.json
     base_name = os.path.basename(image_path)
@@ -47,17 +124,30 @@ def get_expected_results(image_path):
     if not os.path.exists(expected_path):
         pytest.skip(f"No expected results found for {image_path}")
     
-    with open(expected_path, 'r') as f:
-        data = json.load(f)
+    with open(expected_path, 'rb') as f:
+        raw = f.read()
+        file_stat = os.fstat(f.fileno())
+    data = orjson.loads(raw) if orjson is not None else json.loads(raw)
     
-    # Validate against JSON schema if available
+    # Validate against JSON schema if available, unless neither the file nor
+    # the schema changed since it last passed
     if HAS_JSONSCHEMA and os.path.exists(SCHEMA_PATH):
-        with open(SCHEMA_PATH, 'r') as schema_file:
-            schema = json.load(schema_file)
-        try:
-            jsonschema.validate(data, schema)
-        except jsonschema.exceptions.ValidationError as e:
-            pytest.fail(f"JSON schema validation failed for {expected_path}: {e}")
+        schema_stat = os.stat(SCHEMA_PATH)
+        signature = [file_stat.st_mtime_ns, file_stat.st_size, schema_stat.st_mtime_ns, schema_stat.st_size]
+        if _validated.get(expected_path) != signature:
+            try:
+                _get_validator().validate(data)
+            except jsonschema.exceptions.ValidationError as e:
+                pytest.fail(f"JSON schema validation failed for {expected_path}: {e}")
+            _validated[expected_path] = signature
+            _newly_validated[expected_path] = signature
+    
+    # Convert amounts to Decimal once here, since the parsed data is cached
+    if "total" in data:
+        data["total"] = _to_decimal(data["total"])
+    for item in data.get("items", []):
+        if "price" in item:
+            item["price"] = _to_decimal(item["price"])
     
     return data
 
@@ -88,107 +178,61 @@ def test_expected_files_have_required_fields():
             for field in item_fields:
                 assert field in item, f"Missing required field '{field}' in item #{i} in {image_path}"
 
+def _timed_process(processor, image_path):
+    """Process a receipt, logging how long it took when debugging or slow."""
+    start_time = time.time()
+    result = processor.process_image(image_path)
+    elapsed = time.time() - start_time
+    if DEBUG_HANDLERS or elapsed > 5:  # Log if debugging or slow (>5s)
+        print(f"[DEBUG] Processed {os.path.basename(image_path)} in {elapsed:.2f} seconds")
+    return result
+
 def process_with_timeout(processor, image_path, timeout=RECEIPT_TIMEOUT):
-    """Process a receipt with a timeout to prevent hanging."""
-    import threading
-    import queue
+    """Process a receipt with a timeout to prevent hanging.
     
-    result_queue = queue.Queue()
+    Each call runs on its own daemon thread: a running thread cannot be
+    cancelled, so one stuck past its timeout is abandoned rather than left
+    holding a shared worker that later receipts would queue behind.
+    """
+    global _processor
+    done = threading.Event()
+    result_box = {}
     
     def _process():
         try:
-            start_time = time.time()
-            result = processor.process_image(image_path)
-            elapsed = time.time() - start_time
-            if DEBUG_HANDLERS or elapsed > 5:  # Log if debugging or slow (>5s)
-                print(f"[DEBUG] Processed {os.path.basename(image_path)} in {elapsed:.2f} seconds")
-            result_queue.put(("success", result))
+            result_box["result"] = _timed_process(processor, image_path)
         except Exception as e:
-            result_queue.put(("error", str(e)))
+            result_box["error"] = str(e)
+        finally:
+            done.set()
     
-    thread = threading.Thread(target=_process)
-    thread.daemon = True
-    thread.start()
-    thread.join(timeout)
+    threading.Thread(target=_process, daemon=True).start()
     
-    if thread.is_alive():
-        # If still running after timeout, consider it failed
+    if not done.wait(timeout):
+        # If still running after timeout, consider it failed, and leave the
+        # processor to the stuck thread so the next receipt gets a fresh one
+        if _processor is processor:
+            _processor = None
         error_msg = f"Receipt processing timed out after {timeout} seconds: {image_path}"
         print(f"[ERROR] {error_msg}")
         return {"error": error_msg, "items": [], "total": None}
     
-    status, result = result_queue.get()
-    if status == "error":
-        print(f"[ERROR] Receipt processing failed: {result}")
-        return {"error": result, "items": [], "total": None}
+    if "error" in result_box:
+        print(f"[ERROR] Receipt processing failed: {result_box['error']}")
+        return {"error": result_box["error"], "items": [], "total": None}
     
+    result = result_box["result"]
     return result
 
-@pytest.mark.parametrize("store_filter", [None], indirect=False, ids=["all"])
-def test_process_receipts(store_filter):
-    """
-    Test that all receipt images can be processed correctly.
-    
-    Args:
-        store_filter: Optional store name to filter tests by
-    """
-    processor = ReceiptProcessor(debug_mode=DEBUG_HANDLERS)
-    images = get_test_images()
-    results = []
-    
-    for image_path in images:
-        # Get expected results
-        expected = get_expected_results(image_path)
-        expected_store = expected["store"].lower()
-        
-        # Skip if a store filter is provided and doesn't match
-        if store_filter and store_filter.lower() != expected_store:
-            continue
-        
-        # Process the receipt with timeout
-        start_time = time.time()
-        result = process_with_timeout(processor, image_path)
-        
-        # Store result for summary report
-        results.append({
-            "image": os.path.basename(image_path),
-            "store": expected_store,
-            "success": "error" not in result,
-            "time": time.time() - start_time,
-            "expected_items": len(expected["items"]),
-            "found_items": len(result.get("items", [])),
-        })
-        
-        # Basic structure checks
-        assert isinstance(result, dict), f"Result should be a dict for {image_path}"
-        assert "store" in result, f"Result missing 'store' field for {image_path}"
-        assert "items" in result, f"Result missing 'items' field for {image_path}"
-        assert "total" in result, f"Result missing 'total' field for {image_path}"
-        
-        # Store name check
-        assert result["store"].lower() == expected_store, \
-            f"Store mismatch for {image_path}: expected {expected_store}, got {result['store']}"
-        
-        # Items check
-        assert len(result["items"]) == len(expected["items"]), \
-            f"Item count mismatch for {image_path}: expected {len(expected['items'])}, got {len(result['items'])}"
-        
-        # Total check (with tolerance for floating point)
-        if expected["total"] is not None and result["total"] is not None:
-            assert abs(Decimal(str(result["total"])) - Decimal(str(expected["total"]))) < PRICE_TOLERANCE, \
-                f"Total mismatch for {image_path}: expected {expected['total']}, got {result['total']}"
-        
-        # Optional: Check individual items if they should match exactly
-        if expected.get("check_items_exactly", False):
-            for exp_item, res_item in zip(expected["items"], result["items"]):
-                assert exp_item["description"].lower() == res_item["description"].lower(), \
-                    f"Item description mismatch in {image_path}: expected '{exp_item['description']}', got '{res_item['description']}'"
-                if exp_item["price"] is not None and res_item["price"] is not None:
-                    assert abs(Decimal(str(exp_item["price"])) - Decimal(str(res_item["price"]))) < PRICE_TOLERANCE, \
-                        f"Item price mismatch in {image_path}: expected {exp_item['price']}, got {res_item['price']}"
-    
-    # Print a summary of the results
-    if DEBUG_HANDLERS:
+# Per-image results collected for the debug summary printed after the module
+_RESULTS = []
+
+@pytest.fixture(scope="module", autouse=True)
+def _print_summary():
+    """Print a summary of the processed receipts when debugging."""
+    yield
+    results = _RESULTS
+    if DEBUG_HANDLERS and results:
         print("\n====== RECEIPT PROCESSING SUMMARY ======")
         print(f"Total images: {len(results)}")
         print(f"Successful: {sum(1 for r in results if r['success'])}")
@@ -204,16 +248,80 @@ def test_process_receipts(store_filter):
                 print(f"{r['image']} ({r['store']}): {r['time']:.2f}s - {r['found_items']}/{r['expected_items']} items")
             print()
 
-def test_store_handlers_error_handling():
-    """Test that all store handlers gracefully handle invalid input."""
-    # Get a list of all unique stores from expected results
-    stores = set()
-    for image_path in get_test_images():
-        expected = get_expected_results(image_path)
-        stores.add(expected["store"].lower())
+@pytest.fixture
+def expected(image_path):
+    """Expected results for the image under test."""
+    return get_expected_results(image_path)
+
+def test_process_receipt(image_path, expected, processor):
+    """
+    Test that a receipt image can be processed correctly.
+    
+    Images are parametrized by pytest_generate_tests, already narrowed to the
+    store given with --store.
     
-    for store_name in stores:
-        handler = registry.get_handler_for_store(store_name)
+    Args:
+        image_path: Path to the receipt image
+        expected: Expected results for the image
+        processor: Shared ReceiptProcessor
+    """
+    expected_store = expected["store"].lower()
+    
+    # Process the receipt with timeout
+    start_time = time.time()
+    result = process_with_timeout(processor, image_path)
+    
+    # Store result for summary report
+    _RESULTS.append({
+        "image": os.path.basename(image_path),
+        "store": expected_store,
+        "success": "error" not in result,
+        "time": time.time() - start_time,
+        "expected_items": len(expected["items"]),
+        "found_items": len(result.get("items", [])),
+    })
+    
+    # Basic structure checks
+    assert isinstance(result, dict), f"Result should be a dict for {image_path}"
+    assert "store" in result, f"Result missing 'store' field for {image_path}"
+    assert "items" in result, f"Result missing 'items' field for {image_path}"
+    assert "total" in result, f"Result missing 'total' field for {image_path}"
+    
+    # Store name check
+    assert result["store"].lower() == expected_store, \
+        f"Store mismatch for {image_path}: expected {expected_store}, got {result['store']}"
+    
+    # Items check
+    assert len(result["items"]) == len(expected["items"]), \
+        f"Item count mismatch for {image_path}: expected {len(expected['items'])}, got {len(result['items'])}"
+    
+    # Total check (with tolerance for floating point)
+    if expected["total"] is not None and result["total"] is not None:
+        assert abs(_to_decimal(result["total"]) - expected["total"]) < PRICE_TOLERANCE, \
+            f"Total mismatch for {image_path}: expected {expected['total']}, got {result['total']}"
+    
+    # Optional: Check individual items if they should match exactly
+    if expected.get("check_items_exactly", False):
+        for exp_item, res_item in zip(expected["items"], result["items"]):
+            assert exp_item["description"].lower() == res_item["description"].lower(), \
+                f"Item description mismatch in {image_path}: expected '{exp_item['description']}', got '{res_item['description']}'"
+            if exp_item["price"] is not None and res_item["price"] is not None:
+                assert abs(exp_item["price"] - _to_decimal(res_item["price"])) < PRICE_TOLERANCE, \
+                    f"Item price mismatch in {image_path}: expected {exp_item['price']}, got {res_item['price']}"
+
+@lru_cache(maxsize=1)
+def _unique_stores():
+    """Unique lowercased store names in the expected results, collected once."""
+    return frozenset(get_expected_results(image_path)["store"].lower() for image_path in get_test_images())
+
+@pytest.fixture(scope="session")
+def store_handlers():
+    """Map each unique store in the expected results to its registered handler."""
+    return {store_name: registry.get_handler_for_store(store_name) for store_name in _unique_stores()}
+
+def test_store_handlers_error_handling(store_handlers):
+    """Test that all store handlers gracefully handle invalid input."""
+    for store_name, handler in store_handlers.items():
         assert handler is not None, f"No handler found for store: {store_name}"
         
         # Test with empty string
@@ -228,15 +336,9 @@ def test_store_handlers_error_handling():
 
 # Optional: Add specific test cases for edge cases or special features of each store
 # This can be dynamically populated based on the stores found in the expected results
-def test_store_specific_features():
+def test_store_specific_features(store_handlers):
     """Test store-specific features or edge cases."""
     
-    # Get unique stores from expected results
-    stores = set()
-    for image_path in get_test_images():
-        expected = get_expected_results(image_path)
-        stores.add(expected["store"].lower())
-    
     # Define special cases for known stores
     special_cases = {}
     special_cases["costco"] = [("membership_validation", "VALID MEMBER 12345", True)]
@@ -245,10 +347,9 @@ def test_store_specific_features():
     special_cases["key_food"] = [("loyalty_card_detection", "REWARDS CARD: 1234", True)]
     
     # Test applicable special cases
-    for store_name in stores:
+    for store_name, handler in store_handlers.items():
         store_name_lower = store_name.lower().replace('_', '')
         if store_name_lower in special_cases:
-            handler = registry.get_handler_for_store(store_name)
             for feature, test_input, expected in special_cases[store_name_lower]:
                 # Skip if handler doesn't support the feature
                 if not hasattr(handler, feature):
@@ -257,15 +358,21 @@ def test_store_specific_features():
                 result = getattr(handler, feature)(test_input)
                 assert result == expected, f"{feature} test failed for {store_name}"
 
-# Allow filtering tests by store name
-def pytest_addoption(parser):
-    parser.addoption("--store", action="store", default=None, 
-                     help="Filter tests by store name (e.g., costco, h_mart)")
+def _images_for_store(store_filter):
+    """Test images whose expected results name the given store."""
+    store_filter = store_filter.lower()
+    return [
+        image_path for image_path in get_test_images()
+        if os.path.exists(os.path.join('samples', 'expected', f"{os.path.basename(image_path)}.expected.json"))
+        and get_expected_results(image_path)["store"].lower() == store_filter
+    ]
 
+# Allow filtering tests by store name (the --store option is registered in conftest.py)
 def pytest_generate_tests(metafunc):
-    if "store_filter" in metafunc.fixturenames:
-        store_filter = metafunc.config.getoption("store")
-        if store_filter:
-            metafunc.parametrize("store_filter", [store_filter], ids=[store_filter])
-        else:
-            metafunc.parametrize("store_filter", [None], ids=["all"]) 
\ No newline at end of file
+    _bind_validation_cache(metafunc.config)
+    store_filter = metafunc.config.getoption("store", default=None)
+    if "image_path" in metafunc.fixturenames:
+        # Only the filtered store's images are collected, so the others are
+        # never processed or skipped one by one
+        images = _images_for_store(store_filter) if store_filter else get_test_images()
+        metafunc.parametrize("image_path", images, ids=os.path.basename)
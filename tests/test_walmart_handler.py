@@ -44,6 +44,8 @@ class TestWalmartHandler(unittest.TestCase):
             THANK YOU FOR SHOPPING
             AT WALMART
         """
+        # Non-blank lines of the sample, split once for the tests that take lines
+        self.sample_lines = [line.strip() for line in self.sample_receipt.splitlines() if line.strip()]
         
     def test_can_handle(self):
         """Test store name detection."""
@@ -83,7 +85,7 @@ class TestWalmartHandler(unittest.TestCase):
         
     def test_extract_items(self):
         """Test item extraction."""
-        items = self.handler.extract_items(self.sample_receipt)
+        items = self.handler.extract_items(self.sample_lines)
         
         # Check number of items
         self.assertEqual(len(items), 5)
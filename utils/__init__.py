@@ -4,10 +4,16 @@ This package contains utility functions and modules for image processing,
 text analysis, and other helper functionality used by the receipt handlers.
 """
 
-from .image_utils import preprocess_image, get_skew_angle, deskew
-
 __all__ = [
     'preprocess_image',
     'get_skew_angle',
     'deskew'
-] 
\ No newline at end of file
+]
+
+def __getattr__(name):
+    """Import the image helpers on first use, so importing utils stays light."""
+    # image_utils pulls in OpenCV and NumPy, which most utils users never need
+    if name in __all__:
+        from . import image_utils
+        return getattr(image_utils, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}") 
\ No newline at end of file
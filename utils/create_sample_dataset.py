@@ -9,8 +9,16 @@ import shutil
 import argparse
 import logging
 import json
+import uuid
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional, Tuple
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 # Add project root to path to allow importing from project modules
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -27,6 +35,139 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+def _dumps(data: Dict[str, Any]) -> bytes:
+    """Serialize data to indented JSON, using orjson when it is installed."""
+    # default=str covers Decimal and datetime values for both encoders
+    if orjson is not None:
+        return orjson.dumps(
+            data,
+            option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME,
+            default=str
+        )
+    return json.dumps(data, indent=2, default=str).encode()
+
+def _walk_image_files(directory: str) -> List[str]:
+    """Recursively list receipt images under a directory, in os.walk order.
+    
+    os.scandir entries carry the file type from the directory listing, so
+    no extra stat call is needed per entry.
+    """
+    image_files = []
+    subdirs = []
+    with os.scandir(directory) as entries:
+        for entry in entries:
+            if entry.is_dir():
+                # Like os.walk, do not descend into symlinked directories
+                if not entry.is_symlink():
+                    subdirs.append(entry.path)
+            elif entry.name.lower().endswith(('.png', '.jpg', '.jpeg')):
+                image_files.append(entry.path)
+    for subdir in subdirs:
+        image_files.extend(_walk_image_files(subdir))
+    return image_files
+
+def _fast_copy(src: str, dst: str) -> None:
+    """Copy a file and its metadata like shutil.copy2, in-kernel where possible.
+    
+    os.copy_file_range (Linux) copies without a user-space buffer; anything
+    it cannot handle, such as an unsupported filesystem, is finished with a
+    plain buffered copy from where it stopped.
+    """
+    with open(src, 'rb') as fsrc, open(dst, 'wb') as fdst:
+        try:
+            while os.copy_file_range(fsrc.fileno(), fdst.fileno(), 1 << 30):
+                pass
+        except (AttributeError, OSError):
+            shutil.copyfileobj(fsrc, fdst, 1 << 20)
+    shutil.copystat(src, dst)
+
+# Item attributes written to the sample metadata; missing ones are written as null
+_ITEM_FIELDS = ("name", "price", "quantity", "unit_price", "suspicious", "category")
+
+# Per-process state for the worker pool, set up once by _worker_init
+_analyzer: Optional[ReceiptAnalyzer] = None
+_receipt_service: Optional[ReceiptService] = None
+_sample_dir: Optional[str] = None
+
+def _worker_init(sample_dir: str) -> None:
+    """Create the analyzer and receipt service a worker reuses for every image."""
+    global _analyzer, _receipt_service, _sample_dir
+    storage = JSONStorage(base_path="data")
+    _receipt_service = ReceiptService(storage)
+    _analyzer = ReceiptAnalyzer()
+    _sample_dir = sample_dir
+
+def _process_sample(image_path: str) -> Optional[Tuple[Dict[str, Any], str]]:
+    """
+    Copy one receipt image into the sample set and process it.
+    
+    Args:
+        image_path: Path to the uploaded receipt image
+        
+    Returns:
+        The result dictionary and the path to write its metadata to,
+        or None if the image could not be processed
+    """
+    # Generate a unique filename for the sample; a random id cannot collide
+    # between images processed in the same second by different workers
+    sample_id = uuid.uuid4().hex[:12]
+    base_filename = os.path.basename(image_path)
+    name, ext = os.path.splitext(base_filename)
+    sample_filename = f"{name}_{sample_id}{ext}"
+    
+    # Copy image to sample directory
+    sample_image_path = os.path.join(_sample_dir, "images", sample_filename)
+    _fast_copy(image_path, sample_image_path)
+    
+    # Process receipt image
+    try:
+        # Extract OCR text once, with the service's own preprocessing and engine;
+        # the preprocessor decodes image bytes, not paths
+        with open(image_path, 'rb') as f:
+            image_data = f.read()
+        ocr_text = _receipt_service.preprocessor.extract_text(image_data, _receipt_service.ocr)
+        if not ocr_text:
+            # extract_text logs its own failures and returns '' for them
+            logger.warning(f"No OCR text extracted from {image_path}, skipping")
+            return None
+        
+        # Analyze the receipt from that text, without running OCR again
+        receipt = _receipt_service.process_receipt(image_path, {'ocr_text': ocr_text})
+        if 'error' in receipt:
+            raise RuntimeError(receipt['error'])
+        store_name = receipt['store_name']
+        items = receipt.get('items') or []
+        
+        # Create result dictionary
+        result = {
+            "processing_status": "partial" if receipt.get('requires_review') else "completed",
+            "store_name": store_name,
+            "date": receipt.get('date'),
+            "currency": receipt.get('currency'),
+            "subtotal": receipt.get('subtotal'),
+            "tax": receipt.get('tax'),
+            "total": receipt.get('total'),
+            "payment_method": receipt.get('payment_method'),
+            "items_count": len(items),
+            "confidence": receipt.get('confidence'),
+            "original_path": image_path,
+            "sample_path": sample_image_path,
+            "ocr_text": ocr_text,
+            "items": [{field: item.get(field) for field in _ITEM_FIELDS} for item in items]
+        }
+        
+        # Apply vendor-specific processing
+        result = process_vendor_specifics(result, store_name, ocr_text, image_path, _analyzer)
+        
+        metadata_path = os.path.join(_sample_dir, "metadata", f"{name}_{sample_id}.json")
+        return result, metadata_path
+        
+    except Exception as e:
+        logger.error(f"Error processing image {image_path}: {str(e)}")
+        import traceback
+        logger.error(traceback.format_exc())
+        return None
+
 def create_sample_dataset(upload_dir: str = "uploads/receipts",
                           sample_dir: str = "samples",
                           process_all: bool = False,
@@ -42,11 +183,6 @@ def create_sample_dataset(upload_dir: str = "uploads/receipts",
     """
     logger.info(f"Creating sample dataset from {upload_dir} to {sample_dir}")
     
-    # Initialize services
-    storage = JSONStorage(base_path="data")
-    receipt_service = ReceiptService(storage)
-    analyzer = ReceiptAnalyzer()
-    
     # Ensure upload directory exists
     if not os.path.exists(upload_dir):
         logger.error(f"Upload directory does not exist: {upload_dir}")
@@ -58,11 +194,7 @@ def create_sample_dataset(upload_dir: str = "uploads/receipts",
     os.makedirs(os.path.join(sample_dir, "metadata"), exist_ok=True)
     
     # Get all image files from upload directory
-    image_files = []
-    for root, _, files in os.walk(upload_dir):
-        for file in files:
-            if file.lower().endswith(('.png', '.jpg', '.jpeg')):
-                image_files.append(os.path.join(root, file))
+    image_files = _walk_image_files(upload_dir)
     
     # Limit number of samples if not processing all
     if not process_all and len(image_files) > num_samples:
@@ -71,55 +203,19 @@ def create_sample_dataset(upload_dir: str = "uploads/receipts",
     
     logger.info(f"Found {len(image_files)} receipt images to process")
     
-    # Process each image
+    # Process the images in worker processes and write metadata here, in order
     results = []
-    for i, image_path in enumerate(image_files):
-        logger.info(f"Processing image {i+1}/{len(image_files)}: {image_path}")
-        
-        # Generate a unique filename for the sample
-        timestamp = datetime.now().strftime("%Y%m%d%H%M%S")
-        base_filename = os.path.basename(image_path)
-        name, ext = os.path.splitext(base_filename)
-        sample_filename = f"{name}_{timestamp}{ext}"
-        
-        # Copy image to sample directory
-        sample_image_path = os.path.join(sample_dir, "images", sample_filename)
-        shutil.copy2(image_path, sample_image_path)
-        
-        # Process receipt image
-        try:
-            # Extract OCR text
-            ocr_text = analyzer.extract_text(image_path)
-            store_name = analyzer._extract_store_name(ocr_text)
-            
-            # Process with both service and vendor-specific handlers
-            receipt = receipt_service.process_receipt_image(image_path)
-            
-            # Create result dictionary
-            result = {
-                "processing_status": receipt.processing_status,
-                "store_name": receipt.merchant_name or store_name,
-                "date": receipt.date,
-                "currency": receipt.currency_type,
-                "subtotal": receipt.subtotal_amount,
-                "tax": receipt.tax_amount,
-                "total": receipt.total_amount,
-                "payment_method": receipt.payment_method,
-                "items_count": len(receipt.items or []),
-                "confidence": receipt.confidence_score,
-                "original_path": image_path,
-                "sample_path": sample_image_path,
-                "ocr_text": ocr_text,
-                "items": [item.__dict__ for item in (receipt.items or [])]
-            }
-            
-            # Apply vendor-specific processing
-            result = process_vendor_specifics(result, store_name, ocr_text, image_path, analyzer)
+    with ProcessPoolExecutor(max_workers=os.cpu_count(), initializer=_worker_init,
+                             initargs=(sample_dir,)) as executor:
+        for i, processed in enumerate(executor.map(_process_sample, image_files, chunksize=4)):
+            logger.info(f"Processed image {i+1}/{len(image_files)}: {image_files[i]}")
+            if processed is None:
+                continue
+            result, metadata_path = processed
             
             # Save metadata as JSON
-            metadata_path = os.path.join(sample_dir, "metadata", f"{name}_{timestamp}.json")
-            with open(metadata_path, 'w') as f:
-                json.dump(result, f, indent=2, default=str)
+            with open(metadata_path, 'wb') as f:
+                f.write(_dumps(result))
             
             # Add to results
             results.append(result)
@@ -128,38 +224,18 @@ def create_sample_dataset(upload_dir: str = "uploads/receipts",
             logger.info(f"  Store: {result.get('store_name')}")
             logger.info(f"  Total: {result.get('total')}")
             logger.info(f"  Items: {result.get('items_count')}")
-            
-        except Exception as e:
-            logger.error(f"Error processing image {image_path}: {str(e)}")
-            import traceback
-            logger.error(traceback.format_exc())
     
-    # Save summary file
+    # Save summary file, with results counted by store and by status
     summary = {
         "created_at": datetime.now().isoformat(),
         "total_samples": len(results),
-        "by_store": {},
-        "by_status": {}
+        "by_store": dict(Counter(r.get("store_name", "unknown") for r in results)),
+        "by_status": dict(Counter(r.get("processing_status", "unknown") for r in results))
     }
     
-    # Compile statistics
-    for result in results:
-        store = result.get("store_name", "unknown")
-        status = result.get("processing_status", "unknown")
-        
-        # Count by store
-        if store not in summary["by_store"]:
-            summary["by_store"][store] = 0
-        summary["by_store"][store] += 1
-        
-        # Count by status
-        if status not in summary["by_status"]:
-            summary["by_status"][status] = 0
-        summary["by_status"][status] += 1
-    
     # Save summary
-    with open(os.path.join(sample_dir, "summary.json"), 'w') as f:
-        json.dump(summary, f, indent=2, default=str)
+    with open(os.path.join(sample_dir, "summary.json"), 'wb') as f:
+        f.write(_dumps(summary))
     
     logger.info(f"\nCreated {len(results)} samples in {sample_dir}")
     logger.info(f"Summary by store: {summary['by_store']}")
@@ -4,9 +4,10 @@ import ssl
 from datetime import datetime
 from email.mime.multipart import MIMEMultipart
 from email.mime.text import MIMEText
-from typing import Dict, List, Optional, Union
+from typing import Dict, List, Optional, Tuple, Union
 
 from models.expense import BalanceSheet
+from utils.email_templates import render
 
 
 class EmailService:
@@ -18,7 +19,8 @@ class EmailService:
         smtp_port: int = 587,
         sender_email: Optional[str] = None,
         sender_password: Optional[str] = None,
-        recipients: Optional[List[str]] = None
+        recipients: Optional[List[str]] = None,
+        max_per_conn: int = 100
     ):
         self.smtp_server = smtp_server
         self.smtp_port = smtp_port
@@ -26,103 +28,65 @@ class EmailService:
         self.sender_password = sender_password
         self.recipients = recipients or []
         self.logger = logging.getLogger(__name__)
+        # Logged-in SMTP session, opened on first send and reused by later sends
+        # until it has carried max_per_conn messages
+        self.max_per_conn = max_per_conn
+        self._smtp: Optional[smtplib.SMTP] = None
+        self._sent_on_conn = 0
+
+    def __enter__(self) -> "EmailService":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
+
+    def _get_smtp(self) -> smtplib.SMTP:
+        """Return the open SMTP session, reconnecting if the server dropped it."""
+        if self._smtp is not None:
+            try:
+                if self._smtp.noop()[0] == 250:
+                    return self._smtp
+            except (smtplib.SMTPException, OSError):
+                pass
+            self._discard_smtp()
+        
+        # Create a secure connection to the SMTP server
+        context = ssl.create_default_context()
+        server = smtplib.SMTP(self.smtp_server, self.smtp_port)
+        try:
+            server.starttls(context=context)
+            server.login(self.sender_email, self.sender_password)
+        except Exception:
+            server.close()
+            raise
+        self._smtp = server
+        self._sent_on_conn = 0
+        return server
+
+    def _discard_smtp(self) -> None:
+        """Drop the cached SMTP session without talking to the server."""
+        if self._smtp is not None:
+            self._smtp.close()
+            self._smtp = None
+
+    def close(self) -> None:
+        """Log out of and close the cached SMTP session, if one is open."""
+        if self._smtp is None:
+            return
+        try:
+            self._smtp.quit()
+        except (smtplib.SMTPException, OSError):
+            self._smtp.close()
+        self._smtp = None
 
     def _create_weekly_summary_html(self, balance_sheet: BalanceSheet) -> str:
         """Create HTML content for the weekly summary email."""
-        summary = balance_sheet.summary()
-        
-        # Format expenses as a table
-        expense_rows = ""
-        for expense in balance_sheet.expenses:
-            shared_total = expense.shared_total if expense.shared_total is not None else expense.calculate_shared_total()
-            expense_rows += f"""
-            <tr>
-                <td>{expense.date.strftime('%Y-%m-%d')}</td>
-                <td>{expense.payer.value}</td>
-                <td>{expense.store}</td>
-                <td>${expense.total_amount:.2f}</td>
-                <td>${shared_total:.2f}</td>
-                <td>${expense.amount_owed():.2f}</td>
-            </tr>
-            """
-        
-        # Create the email content
-        html = f"""
-        <html>
-            <head>
-                <style>
-                    body {{
-                        font-family: Arial, sans-serif;
-                        margin: 0;
-                        padding: 20px;
-                        color: #333;
-                    }}
-                    .header {{
-                        background-color: #f1f1f1;
-                        padding: 10px;
-                        text-align: center;
-                        border-radius: 5px;
-                        margin-bottom: 20px;
-                    }}
-                    .summary {{
-                        margin-bottom: 20px;
-                        padding: 15px;
-                        background-color: #f9f9f9;
-                        border-radius: 5px;
-                    }}
-                    table {{
-                        width: 100%;
-                        border-collapse: collapse;
-                    }}
-                    th, td {{
-                        padding: 8px;
-                        text-align: left;
-                        border-bottom: 1px solid #ddd;
-                    }}
-                    th {{
-                        background-color: #f2f2f2;
-                    }}
-                    .owed {{
-                        font-weight: bold;
-                        font-size: 18px;
-                        color: #0066cc;
-                    }}
-                </style>
-            </head>
-            <body>
-                <div class="header">
-                    <h2>Weekly Expense Summary</h2>
-                    <p>Week of {datetime.now().strftime('%B %d, %Y')}</p>
-                </div>
-                
-                <div class="summary">
-                    <h3>Current Balance</h3>
-                    <p class="owed">{summary['owed_statement']}</p>
-                    <p>Total expenses this month: ${summary['total_expenses']:.2f}</p>
-                    <p>Total shared expenses: ${summary['total_shared_expenses']:.2f}</p>
-                    <p>Alvand has paid: ${summary['alvand_paid']:.2f}</p>
-                    <p>Roni has paid: ${summary['roni_paid']:.2f}</p>
-                </div>
-                
-                <h3>Recent Expenses</h3>
-                <table>
-                    <tr>
-                        <th>Date</th>
-                        <th>Paid By</th>
-                        <th>Store</th>
-                        <th>Total</th>
-                        <th>Shared</th>
-                        <th>Owed</th>
-                    </tr>
-                    {expense_rows}
-                </table>
-                
-                <p>This is an automated email from your Shared Expenses Tracker.</p>
-            </body>
-        </html>
-        """
-        
-        return html
+        return render(
+            "weekly_summary.html",
+            summary=balance_sheet.summary(),
+            expenses=balance_sheet.expenses,
+            now=datetime.now()
+        )
     
     def _create_monthly_reminder_html(self, month: str) -> str:
         """Create HTML content for the monthly reminder email."""
@@ -130,62 +94,32 @@ class EmailService:
         month_obj = datetime.strptime(month, "%Y-%m")
         month_name = month_obj.strftime("%B %Y")
         
-        html = f"""
-        <html>
-            <head>
-                <style>
-                    body {{
-                        font-family: Arial, sans-serif;
-                        margin: 0;
-                        padding: 20px;
-                        color: #333;
-                    }}
-                    .header {{
-                        background-color: #f1f1f1;
-                        padding: 10px;
-                        text-align: center;
-                        border-radius: 5px;
-                        margin-bottom: 20px;
-                    }}
-                    .reminder {{
-                        margin-bottom: 20px;
-                        padding: 15px;
-                        background-color: #f9f9f9;
-                        border-radius: 5px;
-                    }}
-                    .action {{
-                        margin-top: 20px;
-                        padding: 15px;
-                        background-color: #e6f7ff;
-                        border-radius: 5px;
-                        border-left: 4px solid #0066cc;
-                    }}
-                </style>
-            </head>
-            <body>
-                <div class="header">
-                    <h2>Monthly Expense Reminder</h2>
-                    <p>{month_name}</p>
-                </div>
-                
-                <div class="reminder">
-                    <h3>Month End Approaching</h3>
-                    <p>The month of {month_name} is coming to an end.</p>
-                    <p>This is a friendly reminder to submit any remaining receipts that you haven't entered into the system yet.</p>
-                </div>
-                
-                <div class="action">
-                    <h3>Action Required</h3>
-                    <p>Please log in to your Shared Expenses Tracker and make sure all your expenses are entered before the end of the month.</p>
-                    <p>This will ensure an accurate settlement for {month_name}.</p>
-                </div>
-                
-                <p>This is an automated email from your Shared Expenses Tracker.</p>
-            </body>
-        </html>
-        """
+        return render("monthly_reminder.html", month_name=month_name)
+    
+    def _build_message(self, subject: str, html_content: str, email_recipients: List[str]) -> MIMEMultipart:
+        """Build an HTML email message from the sender to the given recipients."""
+        message = MIMEMultipart()
+        message["Subject"] = subject
+        message["From"] = self.sender_email
+        message["To"] = ", ".join(email_recipients)
+        
+        # Attach the HTML content
+        message.attach(MIMEText(html_content, "html"))
+        return message
+    
+    def _send_message(self, message: MIMEMultipart) -> None:
+        """Send a message on the shared session, reconnecting when needed."""
+        # Start a fresh session once the current one has carried max_per_conn messages
+        if self._smtp is not None and self._sent_on_conn >= self.max_per_conn:
+            self.close()
         
-        return html
+        try:
+            self._get_smtp().send_message(message)
+        except (smtplib.SMTPServerDisconnected, smtplib.SMTPConnectError):
+            # The session went away between the health check and the send; retry once
+            self._discard_smtp()
+            self._get_smtp().send_message(message)
+        self._sent_on_conn += 1
     
     def send_email(
         self,
@@ -204,23 +138,10 @@ class EmailService:
             self.logger.warning("No recipients specified. Email not sent.")
             return False
         
-        # Create the email message
-        message = MIMEMultipart()
-        message["Subject"] = subject
-        message["From"] = self.sender_email
-        message["To"] = ", ".join(email_recipients)
-        
-        # Attach the HTML content
-        message.attach(MIMEText(html_content, "html"))
+        message = self._build_message(subject, html_content, email_recipients)
         
         try:
-            # Create a secure connection to the SMTP server
-            context = ssl.create_default_context()
-            with smtplib.SMTP(self.smtp_server, self.smtp_port) as server:
-                server.starttls(context=context)
-                server.login(self.sender_email, self.sender_password)
-                server.send_message(message)
-            
+            self._send_message(message)
             self.logger.info(f"Email sent successfully to {email_recipients}")
             return True
         
@@ -228,6 +149,47 @@ class EmailService:
             self.logger.error(f"Failed to send email: {str(e)}")
             return False
     
+    def send_bulk(
+        self,
+        messages: List[Tuple[str, str, Optional[List[str]]]]
+    ) -> List[bool]:
+        """
+        Send several emails over one SMTP session.
+        
+        Args:
+            messages: (subject, html_content, recipients) tuples; recipients
+                may be None to use the default recipients
+        
+        Returns:
+            Whether each message was sent, in the same order
+        """
+        if not self.sender_email or not self.sender_password:
+            self.logger.warning("Sender email or password not configured. Emails not sent.")
+            return [False] * len(messages)
+        
+        sent = []
+        for subject, html_content, recipients in messages:
+            email_recipients = recipients if recipients else self.recipients
+            if not email_recipients:
+                self.logger.warning(f"No recipients specified for '{subject}'. Email not sent.")
+                sent.append(False)
+                continue
+            
+            message = self._build_message(subject, html_content, email_recipients)
+            try:
+                self._send_message(message)
+                sent.append(True)
+            except smtplib.SMTPRecipientsRefused as e:
+                # Bad addresses only affect this message; carry on with the rest
+                self.logger.error(f"Recipients refused for '{subject}': {e.recipients}")
+                sent.append(False)
+            except Exception as e:
+                self.logger.error(f"Failed to send email '{subject}': {str(e)}")
+                sent.append(False)
+        
+        self.logger.info(f"Bulk send finished: {sum(sent)}/{len(messages)} emails sent")
+        return sent
+    
     def send_weekly_summary(
         self,
         balance_sheet: BalanceSheet,
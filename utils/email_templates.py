@@ -0,0 +1,35 @@
+"""
+Jinja2 templates for notification emails.
+
+The templates live in templates/email/. They are compiled on first use and
+kept by the module-level environment, so every email after the first reuses
+the compiled template.
+"""
+
+import os
+from typing import Any
+
+from jinja2 import Environment, FileSystemLoader, select_autoescape
+
+TEMPLATE_DIR = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'templates', 'email'
+)
+
+
+def _money(value: Any) -> str:
+    """Format an amount with two decimals, as the f-string templates did."""
+    return f"{value:.2f}"
+
+
+# auto_reload is off: the templates ship with the code and do not change while running
+ENV = Environment(
+    loader=FileSystemLoader(TEMPLATE_DIR),
+    autoescape=select_autoescape(['html']),
+    auto_reload=False,
+)
+ENV.filters['money'] = _money
+
+
+def render(template_name: str, **context: Any) -> str:
+    """Render one of the email templates with the given context."""
+    return ENV.get_template(template_name).render(**context)
@@ -9,11 +9,32 @@ import csv
 import io
 import logging
 from datetime import datetime
-from typing import Dict, List, Any, Union, Optional
+from typing import Dict, List, Any, Union, Optional, Iterable, Iterator
 from uuid import UUID
 
 logger = logging.getLogger(__name__)
 
+class _RowBuffer(list):
+    """File-like sink for csv.writer that collects each written row in a list."""
+    write = list.append
+
+
+def _encode_rows(rows: Iterable[List[Any]]) -> Iterator[str]:
+    """
+    Encode rows as CSV lines one at a time.
+    
+    Args:
+        rows: Iterable of row lists
+        
+    Yields:
+        Each row as a CSV-formatted string
+    """
+    buffer = _RowBuffer()
+    writer = csv.writer(buffer)
+    for row in rows:
+        writer.writerow(row)
+        yield buffer.pop()
+
 class ExportManager:
     """Manages the export of expense data to various formats."""
     
@@ -37,32 +58,43 @@ class ExportManager:
         Returns:
             StringIO object containing CSV data
         """
-        output = io.StringIO()
-        writer = csv.writer(output)
+        return io.StringIO(''.join(self.iter_csv(data, export_type)))
+    
+    def iter_csv(self, data: Dict[str, Any], export_type: str = 'monthly') -> Iterator[str]:
+        """
+        Generate CSV data line by line, for streaming to a response.
         
+        Args:
+            data: Dictionary containing expense data to export
+            export_type: Type of export ('monthly', 'summary', etc.)
+            
+        Returns:
+            Iterator of CSV-formatted lines
+        """
         if export_type == 'monthly':
-            self._generate_monthly_csv(writer, data)
+            rows = self._iter_monthly_rows(data)
         elif export_type == 'summary':
-            self._generate_summary_csv(writer, data)
+            rows = self._iter_summary_rows(data)
         else:
             raise ValueError(f"Unknown export type: {export_type}")
             
-        output.seek(0)
-        return output
+        return _encode_rows(rows)
         
-    def _generate_monthly_csv(self, writer: csv.writer, data: Dict[str, Any]) -> None:
+    def _iter_monthly_rows(self, data: Dict[str, Any]) -> Iterator[List[Any]]:
         """
-        Generate a CSV file for monthly expense data.
+        Generate the CSV rows for monthly expense data.
         
         Args:
-            writer: CSV writer object
             data: Dictionary containing monthly expense data
+            
+        Yields:
+            Each CSV row as a list
         """
         # Write the header
-        writer.writerow([
+        yield [
             'Date', 'Store', 'Item', 'Amount', 'Payer', 'Shared', 
             'Confidence', 'Receipt ID', 'Flagged'
-        ])
+        ]
         
         # Format: YYYY-MM
         month = data.get('month', datetime.now().strftime('%Y-%m'))
@@ -89,36 +121,38 @@ class ExportManager:
                 confidence = item.get('confidence_score', '')
                 flagged = 'Yes' if item.get('flagged_for_review', False) else 'No'
                 
-                writer.writerow([
+                yield [
                     date, store, item_name, amount, payer, shared, 
                     confidence, receipt_id, flagged
-                ])
+                ]
         
         # Add a blank row
-        writer.writerow([])
+        yield []
         
         # Add summary section if available
         summary = data.get('summary', {})
         if summary:
-            writer.writerow(['Summary'])
-            writer.writerow(['Total Expenses', summary.get('total_expenses', 0.0)])
-            writer.writerow(['Balance', summary.get('balance', 0.0)])
+            yield ['Summary']
+            yield ['Total Expenses', summary.get('total_expenses', 0.0)]
+            yield ['Balance', summary.get('balance', 0.0)]
             
             # Add who owes who statement
             owed_statement = summary.get('owed_statement', '')
             if owed_statement:
-                writer.writerow(['Balance Statement', owed_statement])
+                yield ['Balance Statement', owed_statement]
                 
-    def _generate_summary_csv(self, writer: csv.writer, data: Dict[str, Any]) -> None:
+    def _iter_summary_rows(self, data: Dict[str, Any]) -> Iterator[List[Any]]:
         """
-        Generate a CSV file for expense summary data.
+        Generate the CSV rows for expense summary data.
         
         Args:
-            writer: CSV writer object
             data: Dictionary containing summary expense data
+            
+        Yields:
+            Each CSV row as a list
         """
         # Write the header
-        writer.writerow(['Month', 'Total Expenses', 'Balance', 'Statement'])
+        yield ['Month', 'Total Expenses', 'Balance', 'Statement']
         
         # Write data for each month
         months = data.get('months', [])
@@ -128,15 +162,15 @@ class ExportManager:
             balance = month_data.get('balance', 0.0)
             statement = month_data.get('owed_statement', '')
             
-            writer.writerow([month, total, balance, statement])
+            yield [month, total, balance, statement]
             
         # Add overall summary if available
         overall = data.get('overall', {})
         if overall:
-            writer.writerow([])
-            writer.writerow(['Overall Summary'])
-            writer.writerow(['Total Expenses', overall.get('total_expenses', 0.0)])
-            writer.writerow(['Net Balance', overall.get('net_balance', 0.0)])
+            yield []
+            yield ['Overall Summary']
+            yield ['Total Expenses', overall.get('total_expenses', 0.0)]
+            yield ['Net Balance', overall.get('net_balance', 0.0)]
         
     def export_monthly_data(self, month: str) -> io.StringIO:
         """
@@ -148,6 +182,33 @@ class ExportManager:
         Returns:
             StringIO object containing CSV data
         """
+        return self.generate_csv(self._get_monthly_data(month), 'monthly')
+    
+    def export_monthly_data_stream(self, month: str) -> Iterator[str]:
+        """
+        Export data for a specific month as a stream of CSV lines.
+        
+        The month is loaded before returning, so storage errors are raised here
+        rather than part-way through a streamed response.
+        
+        Args:
+            month: Month in YYYY-MM format
+            
+        Returns:
+            Iterator of CSV-formatted lines
+        """
+        return self.iter_csv(self._get_monthly_data(month), 'monthly')
+    
+    def _get_monthly_data(self, month: str) -> Dict[str, Any]:
+        """
+        Load a month's expenses and summary for export.
+        
+        Args:
+            month: Month in YYYY-MM format
+            
+        Returns:
+            Dictionary containing the month's expense data
+        """
         if not self.storage:
             raise ValueError("Storage is required for monthly export")
         
@@ -156,14 +217,12 @@ class ExportManager:
             balance_sheet = self.storage.get_balance_sheet(month)
             
             # Convert to dictionary representation
-            data = {
+            return {
                 'month': month,
                 'expenses': [expense.to_dict() for expense in balance_sheet.expenses],
                 'summary': balance_sheet.summary()
             }
             
-            return self.generate_csv(data, 'monthly')
-            
         except Exception as e:
             logger.error(f"Error exporting monthly data for {month}: {str(e)}")
             raise
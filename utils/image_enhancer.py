@@ -7,7 +7,6 @@ import os
 import cv2
 import numpy as np
 import logging
-from PIL import Image, ImageEnhance, ImageFilter
 
 # Configure logging
 logging.basicConfig(
@@ -16,6 +15,10 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# PIL's ImageFilter.SMOOTH kernel, which ImageEnhance.Sharpness blends against
+_SMOOTH_KERNEL = np.array([[1, 1, 1], [1, 5, 1], [1, 1, 1]], np.float32) / 13
+_IDENTITY_KERNEL = np.array([[0, 0, 0], [0, 1, 0], [0, 0, 0]], np.float32)
+
 class ImageEnhancer:
     """Class for enhancing images to improve OCR results."""
     
@@ -36,7 +39,8 @@ class ImageEnhancer:
     
     def enhance(self, resize: bool = True, target_width: int = 2000,
                 contrast: float = 1.5, brightness: float = 1.2,
-                sharpness: float = 1.5, denoise: bool = True) -> np.ndarray:
+                sharpness: float = 1.5, denoise: bool = True,
+                denoise_mode: str = 'bilateral', thicken: bool = False) -> np.ndarray:
         """
         Enhance an image for better OCR results.
         
@@ -47,10 +51,16 @@ class ImageEnhancer:
             brightness: Brightness enhancement factor
             sharpness: Sharpness enhancement factor
             denoise: Whether to apply denoising
+            denoise_mode: Denoising filter: 'bilateral' (default), 'gaussian', or
+                'nlmeans' (much slower, for high-quality batch runs)
+            thicken: Whether to dilate the binarized text with a 2x2 kernel
             
         Returns:
             Enhanced image as a numpy array
         """
+        if denoise and denoise_mode not in ('bilateral', 'gaussian', 'nlmeans'):
+            raise ValueError(f"Unknown denoise mode: {denoise_mode}")
+        
         # Read the image
         try:
             image = cv2.imread(self.image_path)
@@ -65,16 +75,19 @@ class ImageEnhancer:
             logger.error(f"Error reading image: {str(e)}")
             return None
         
-        # Resize the image if requested
+        # Resize the image if requested, before the per-pixel CLAHE/denoise work.
+        # Long receipts are bounded by height too, since their width may already fit
         if resize:
             height, width = image.shape[:2]
-            if width > target_width:
-                scale = target_width / width
+            scale = min(target_width / width, target_width * 1.5 / height)
+            if scale < 1.0:
+                new_width = int(width * scale)
                 new_height = int(height * scale)
-                image = cv2.resize(image, (target_width, new_height))
+                image = cv2.resize(image, (new_width, new_height),
+                                   interpolation=cv2.INTER_AREA)
                 
                 if self.debug:
-                    logger.debug(f"Resized image to {target_width}x{new_height}")
+                    logger.debug(f"Resized image to {new_width}x{new_height}")
                     self._save_debug_image(image, "02_resized.jpg")
         
         # Convert to grayscale
@@ -96,32 +109,22 @@ class ImageEnhancer:
         if self.debug:
             self._save_debug_image(enhanced, "05_clahe.jpg")
         
-        # Convert to PIL image for easier enhancement
-        pil_image = Image.fromarray(enhanced)
-        
-        # Enhance contrast
-        contrast_enhancer = ImageEnhance.Contrast(pil_image)
-        pil_image = contrast_enhancer.enhance(contrast)
-        
-        # Enhance brightness
-        brightness_enhancer = ImageEnhance.Brightness(pil_image)
-        pil_image = brightness_enhancer.enhance(brightness)
-        
-        # Enhance sharpness
-        sharpness_enhancer = ImageEnhance.Sharpness(pil_image)
-        pil_image = sharpness_enhancer.enhance(sharpness)
+        # Enhance contrast, brightness and sharpness
+        enhanced = self._adjust(enhanced, contrast, brightness, sharpness)
         
         # Apply median filter to reduce noise
-        pil_image = pil_image.filter(ImageFilter.MedianFilter(size=3))
-        
-        # Convert back to OpenCV format
-        enhanced = np.array(pil_image)
+        enhanced = cv2.medianBlur(enhanced, 3)
         if self.debug:
             self._save_debug_image(enhanced, "06_enhanced.jpg")
         
         # Apply denoising if requested
         if denoise:
-            enhanced = cv2.fastNlMeansDenoising(enhanced, None, 10, 7, 21)
+            if denoise_mode == 'nlmeans':
+                enhanced = cv2.fastNlMeansDenoising(enhanced, None, 10, 7, 21)
+            elif denoise_mode == 'gaussian':
+                enhanced = cv2.GaussianBlur(enhanced, (3, 3), 0)
+            else:
+                enhanced = cv2.bilateralFilter(enhanced, 5, 50, 50)
             if self.debug:
                 self._save_debug_image(enhanced, "07_denoised.jpg")
         
@@ -130,13 +133,45 @@ class ImageEnhancer:
         if self.debug:
             self._save_debug_image(binary, "08_binary.jpg")
         
-        # Apply dilation to thicken text slightly
-        kernel = np.ones((1, 1), np.uint8)
-        dilated = cv2.dilate(binary, kernel, iterations=1)
-        if self.debug:
-            self._save_debug_image(dilated, "09_dilated.jpg")
+        # Optionally apply dilation to thicken text slightly
+        if thicken:
+            binary = cv2.dilate(binary, np.ones((2, 2), np.uint8), iterations=1)
+            if self.debug:
+                self._save_debug_image(binary, "09_dilated.jpg")
+        
+        return binary
+    
+    def _adjust(self, gray_image: np.ndarray, contrast: float,
+                brightness: float, sharpness: float) -> np.ndarray:
+        """
+        Apply PIL's ImageEnhance contrast, brightness and sharpness in OpenCV.
+        
+        Each stage saturates to 8 bits before the next, as PIL's do. Pixels
+        can still differ from PIL's by a rounding step: addWeighted rounds
+        where PIL truncates, and the sharpness kernel is applied in one pass
+        instead of blending with a separately rounded smoothed image. PIL
+        leaves the one-pixel border unsharpened; here it is sharpened against
+        replicated edge pixels.
+        
+        Args:
+            gray_image: Grayscale image as a numpy array
+            contrast: Contrast enhancement factor
+            brightness: Brightness enhancement factor
+            sharpness: Sharpness enhancement factor
+            
+        Returns:
+            Adjusted image as a numpy array
+        """
+        # Contrast blends with the mean gray level
+        mean = int(cv2.mean(gray_image)[0] + 0.5)
+        adjusted = cv2.addWeighted(gray_image, contrast, gray_image, 0, (1.0 - contrast) * mean)
+        
+        # Brightness scales towards black
+        adjusted = cv2.addWeighted(adjusted, brightness, adjusted, 0, 0)
         
-        return dilated
+        # Sharpness blends with the smoothed image, folded into a single kernel
+        kernel = sharpness * _IDENTITY_KERNEL + (1.0 - sharpness) * _SMOOTH_KERNEL
+        return cv2.filter2D(adjusted, -1, kernel, borderType=cv2.BORDER_REPLICATE)
     
     def _is_inverted(self, gray_image: np.ndarray) -> bool:
         """
@@ -177,16 +212,18 @@ class ImageEnhancer:
         except Exception as e:
             logger.error(f"Error saving debug image: {str(e)}")
 
-def enhance_receipt_image(image_path: str, debug: bool = False) -> np.ndarray:
+def enhance_receipt_image(image_path: str, debug: bool = False,
+                          denoise_mode: str = 'bilateral') -> np.ndarray:
     """
     Enhance a receipt image for better OCR results.
     
     Args:
         image_path: Path to the image file
         debug: Whether to enable debug logging and save intermediate images
+        denoise_mode: Denoising filter, see ImageEnhancer.enhance
         
     Returns:
         Enhanced image as a numpy array
     """
     enhancer = ImageEnhancer(image_path, debug)
-    return enhancer.enhance() 
\ No newline at end of file
+    return enhancer.enhance(denoise_mode=denoise_mode) 
\ No newline at end of file
@@ -15,6 +15,14 @@ import traceback
 
 logger = logging.getLogger(__name__)
 
+# Item patterns tried after any store-specific ones
+_DEFAULT_ITEM_PATTERNS = [
+    r'^([\d.]+)\s*(?:LB|lb|Lb)\s+@\s+(\d+\.\d{2})/(?:LB|lb|Lb)\s+(.*?)\s+(\d+\.\d{2})',
+    r'^(\d+)\s+@\s+(\d+\.\d{2})\s+(.*?)\s+(\d+\.\d{2})',
+    r'^\d{3,4}\s+(.*?)\s+(\d+\.\d{2})',
+    r'^(.*?)\s+(\d+\.\d{2})',
+]
+
 # Import OCR-related modules after logger setup
 from utils.image_preprocessor import ImagePreprocessor
 from ocr.google_vision_config import GoogleVisionConfig
@@ -171,6 +179,21 @@ class ReceiptAnalyzer:
         self.validation_notes = []
         self.requires_review = False
         
+        # Compiled item pattern tables, built on first use per store
+        self._store_tables: Dict[Optional[str], Tuple[re.Pattern, ...]] = {}
+        
+    def _get_store_table(self, store_name: Optional[str]) -> Tuple[re.Pattern, ...]:
+        """Get the compiled item patterns for a store, compiling them on first use."""
+        table = self._store_tables.get(store_name)
+        if table is None:
+            store_info = self.store_patterns.get(store_name, {})
+            table = tuple(
+                re.compile(pattern)
+                for pattern in store_info.get('item_patterns', []) + _DEFAULT_ITEM_PATTERNS
+            )
+            self._store_tables[store_name] = table
+        return table
+        
     def _fuzzy_match_store(self, text: str, store_name: str, threshold: float) -> bool:
         """Fuzzy match store name in text with improved accuracy."""
         # Get first 8 lines of text for header matching (increased from 5)
@@ -355,19 +378,8 @@ class ReceiptAnalyzer:
             continuation_buffer = []
             seen_items = defaultdict(int)  # Track duplicates
             
-            # Get store-specific patterns if available
-            store_info = self.store_patterns.get(store_name, {})
-            store_patterns = store_info.get('item_patterns', [])
-            
-            # Default patterns if no store-specific ones exist
-            default_patterns = [
-                r'^([\d.]+)\s*(?:LB|lb|Lb)\s+@\s+(\d+\.\d{2})/(?:LB|lb|Lb)\s+(.*?)\s+(\d+\.\d{2})',
-                r'^(\d+)\s+@\s+(\d+\.\d{2})\s+(.*?)\s+(\d+\.\d{2})',
-                r'^\d{3,4}\s+(.*?)\s+(\d+\.\d{2})',
-                r'^(.*?)\s+(\d+\.\d{2})',
-            ]
-            
-            all_patterns = store_patterns + default_patterns
+            # Store-specific patterns followed by the defaults, compiled once per store
+            all_patterns = self._get_store_table(store_name)
             
             for i, line in enumerate(lines):
                 line = line.strip()
@@ -381,7 +393,7 @@ class ReceiptAnalyzer:
                 # Try all patterns
                 item_found = False
                 for pattern in all_patterns:
-                    match = re.search(pattern, line)
+                    match = pattern.search(line)
                     if match:
                         # Extract item details based on pattern
                         groups = match.groups()
@@ -431,7 +443,7 @@ class ReceiptAnalyzer:
                     
                     # Try parsing merged line
                     for pattern in all_patterns:
-                        match = re.search(pattern, merged_line)
+                        match = pattern.search(merged_line)
                         if match:
                             # Process merged line as a new item
                             name = match.group(1)
@@ -749,6 +761,27 @@ class ReceiptAnalyzer:
             logger.error(f"Error extracting totals: {str(e)}")
             return {'subtotal': None, 'tax': None, 'total': None}
             
+    def parse_batch(self, items: List[Tuple[str, Optional[str]]]) -> List[Dict[str, Any]]:
+        """
+        Extract items and totals from many receipt texts in one call.
+        
+        Item patterns are compiled once per store and reused for every text
+        of that store, so large batches don't pay the setup cost per receipt.
+        
+        Args:
+            items: (text, store_name) pairs; store_name may be None
+            
+        Returns:
+            One dictionary per input pair, in order, with 'items' and 'totals'
+        """
+        results = []
+        for text, store_name in items:
+            results.append({
+                'items': self._extract_items(text, store_name),
+                'totals': self._extract_totals(text)
+            })
+        return results
+        
     def _calculate_confidence(self, items: List[Dict], totals: Dict, has_store: bool) -> float:
         """Calculate overall confidence score."""
         try:
@@ -47,16 +47,19 @@ class Scheduler:
                 now = datetime.datetime.now()
                 current_month = self._get_current_month()
                 
-                # Weekly summary on Sunday
-                if self._is_sunday():
-                    self.logger.info("Sending weekly summary email")
-                    balance_sheet = self.storage.get_balance_sheet(current_month)
-                    self.email_service.send_weekly_summary(balance_sheet)
-                
-                # Monthly reminder during the last week of the month
-                if self._is_last_week_of_month() and now.day >= 25:
-                    self.logger.info("Sending monthly reminder email")
-                    self.email_service.send_monthly_reminder(current_month)
+                # Share one SMTP session between today's emails, and close it
+                # rather than hold it open through the day's sleep
+                with self.email_service:
+                    # Weekly summary on Sunday
+                    if self._is_sunday():
+                        self.logger.info("Sending weekly summary email")
+                        balance_sheet = self.storage.get_balance_sheet(current_month)
+                        self.email_service.send_weekly_summary(balance_sheet)
+                    
+                    # Monthly reminder during the last week of the month
+                    if self._is_last_week_of_month() and now.day >= 25:
+                        self.logger.info("Sending monthly reminder email")
+                        self.email_service.send_monthly_reminder(current_month)
                 
                 # Sleep for a day
                 time.sleep(86400)  # 24 hours in seconds